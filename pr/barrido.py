@@ -0,0 +1,376 @@
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from proyecto import HammingChannel, CHANNEL_KEYS, AWGNChannel, decode_outcomes, make_channel, uncoded_ber
+
+# =============================================================================
+# BARRIDO MONTE CARLO DE BER / FER (MULTINÚCLEO)
+# =============================================================================
+# Cada punto de la rejilla (probabilidad de ruido) se reparte en varias tareas
+# independientes, cada una con su propio flujo aleatorio (SeedSequence.spawn).
+# Los contadores de todas las tareas se suman al final.
+
+BATCH_BLOCKS = 1 << 16
+COUNTERS = ("blocks", "bit_errors", "block_errors", "channel_bit_errors",
+            "corrected", "miscorrected", "uncorrectable", "undetected")
+AWGN_COUNTERS = ("blocks", "hard_bit_errors", "soft_bit_errors", "hard_block_errors",
+                 "soft_block_errors", "hard_seconds", "soft_seconds")
+
+# Número de bits a 1 de cada byte
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+_image_cache = {}
+
+
+def load_image_bits(path):
+    # Bits de la imagen en grises; se carga una vez por proceso
+    if path not in _image_cache:
+        from PIL import Image
+        with Image.open(path) as img:
+            data = np.asarray(img.convert("L")).ravel()
+        _image_cache[path] = np.unpackbits(data)
+    return _image_cache[path]
+
+
+def _next_batch(hamming, source, size):
+    # Bloques de datos (N x k): aleatorios o una ventana de la imagen
+    if source is None:
+        return hamming.rng.integers(0, 2, size=(size, hamming.k), dtype=np.uint8)
+    start = int(hamming.rng.integers(0, len(source)))
+    return np.take(source, np.arange(start, start + size * hamming.k), mode="wrap").reshape(size, hamming.k)
+
+
+def wilson_interval(k, n, z=1.96):
+    if n == 0:
+        return 0.0, 1.0
+    phat = k / n
+    denom = 1 + z * z / n
+    centre = phat + z * z / (2 * n)
+    margin = z * math.sqrt(phat * (1 - phat) / n + z * z / (4 * n * n))
+    return max(0.0, (centre - margin) / denom), min(1.0, (centre + margin) / denom)
+
+
+def simulate_task(task):
+    # Una tarea: hasta `blocks` bloques de un punto, o menos si alcanza `target_errors`
+    p, model, blocks, target_errors, seed, image_path, r, extended = task
+    start = time.perf_counter()
+    hamming = HammingChannel(r, extended, seed=seed)
+    channel = make_channel(model, p)
+    source = load_image_bits(image_path) if image_path else None
+
+    counts = dict.fromkeys(COUNTERS, 0)
+    while counts["blocks"] < blocks:
+        size = min(BATCH_BLOCKS, blocks - counts["blocks"])
+        sent = _next_batch(hamming, source, size)
+
+        if hamming.packed:
+            # Camino rápido con tablas: un uint8 por código
+            data_weights = np.array([8, 4, 2, 1], dtype=np.uint8)
+            sent_values = sent @ data_weights
+            received, flips = hamming.transmit_packed(hamming.encode_packed(sent_values), channel)
+            decoded, detected, pos = hamming.decode_packed(received)
+            bit_errors = POPCOUNT[decoded ^ sent_values]
+            channel_errors = POPCOUNT[flips]
+        else:
+            received, flips = hamming.transmit(hamming.encode_blocks(sent), channel)
+            decoded, detected, _, pos = hamming.decode_blocks(received)
+            bit_errors = (decoded != sent).sum(axis=1)
+            channel_errors = flips.sum(axis=1)
+
+        # Misma clasificación que la instrumentación de la interfaz y la consola
+        outcomes = decode_outcomes(channel_errors != 0, detected, pos, bit_errors)
+        counts["blocks"] += size
+        counts["bit_errors"] += outcomes["residual_bit_errors"]
+        counts["block_errors"] += int((bit_errors != 0).sum())
+        counts["channel_bit_errors"] += int(channel_errors.sum())
+        for key in ("corrected", "miscorrected", "uncorrectable", "undetected"):
+            counts[key] += outcomes[key]
+
+        if target_errors and counts["bit_errors"] >= target_errors:
+            break
+    return p, counts, time.perf_counter() - start
+
+
+def summarize(p, counts, data_bits=4, code_bits=7):
+    bits = counts["blocks"] * data_bits
+    ber_low, ber_high = wilson_interval(counts["bit_errors"], bits)
+    bler_low, bler_high = wilson_interval(counts["block_errors"], counts["blocks"])
+    return {
+        "p": p,
+        **counts,
+        "ber": counts["bit_errors"] / bits if bits else 0.0,
+        "ber_low": ber_low,
+        "ber_high": ber_high,
+        "bler": counts["block_errors"] / counts["blocks"] if counts["blocks"] else 0.0,
+        "bler_low": bler_low,
+        "bler_high": bler_high,
+        "channel_ber": counts["channel_bit_errors"] / (counts["blocks"] * code_bits) if counts["blocks"] else 0.0,
+    }
+
+
+def run_sweep(probs, blocks, model="bsc", target_errors=0, seed=None, image_path=None, workers=None,
+              r=3, extended=False):
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(probs) * shards)
+
+    tasks = []
+    for i, p in enumerate(probs):
+        per_shard = -(-blocks // shards)
+        shard_target = -(-target_errors // shards) if target_errors else 0
+        for j in range(shards):
+            tasks.append((p, model, per_shard, shard_target, seeds[i * shards + j], image_path, r, extended))
+
+    # Tiempo por punto: suma de lo que tardaron sus tareas (segundos de CPU-trabajador)
+    totals = {p: dict.fromkeys(COUNTERS, 0) for p in probs}
+    seconds = dict.fromkeys(probs, 0.0)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for p, counts, task_seconds in pool.map(simulate_task, tasks):
+            for key, value in counts.items():
+                totals[p][key] += value
+            seconds[p] += task_seconds
+
+    code = HammingChannel(r, extended)
+    results = [summarize(p, totals[p], code.k, code.n) for p in probs]
+    for row in results:
+        row["task_seconds"] = seconds[row["p"]]
+    return results
+
+
+# =============================================================================
+# BARRIDO EN Eb/N0 (CANAL AWGN): DECODIFICACIÓN DURA FRENTE A BLANDA
+# =============================================================================
+# Ambos decodificadores reciben las mismas muestras BPSK en cada lote.
+def simulate_awgn_task(task):
+    ebn0, blocks, target_errors, seed, image_path, r, extended = task
+    start = time.perf_counter()
+    hamming = HammingChannel(r, extended, seed=seed)
+    channel = AWGNChannel.for_code(hamming, ebn0)
+    source = load_image_bits(image_path) if image_path else None
+
+    counts = dict.fromkeys(AWGN_COUNTERS, 0)
+    while counts["blocks"] < blocks:
+        size = min(BATCH_BLOCKS, blocks - counts["blocks"])
+        sent = _next_batch(hamming, source, size)
+        samples = channel.soft_apply(hamming.encode_blocks(sent), hamming.rng)
+
+        for name, decode in (("hard", hamming.decode_hard), ("soft", hamming.decode_soft)):
+            decode_start = time.perf_counter()
+            wrong = decode(samples) != sent
+            counts[f"{name}_seconds"] += time.perf_counter() - decode_start
+            counts[f"{name}_bit_errors"] += int(wrong.sum())
+            counts[f"{name}_block_errors"] += int(wrong.any(axis=1).sum())
+        counts["blocks"] += size
+
+        # Se para cuando el mejor decodificador (el blando) ya tiene bastantes errores
+        if target_errors and counts["soft_bit_errors"] >= target_errors:
+            break
+    return ebn0, counts, time.perf_counter() - start
+
+
+def summarize_awgn(ebn0, counts, data_bits=4):
+    bits = counts["blocks"] * data_bits
+    row = {"ebn0_db": ebn0, **counts, "uncoded_ber": uncoded_ber(ebn0)}
+    for name in ("hard", "soft"):
+        low, high = wilson_interval(counts[f"{name}_bit_errors"], bits)
+        row[f"{name}_ber"] = counts[f"{name}_bit_errors"] / bits if bits else 0.0
+        row[f"{name}_ber_low"], row[f"{name}_ber_high"] = low, high
+        row[f"{name}_bler"] = counts[f"{name}_block_errors"] / counts["blocks"] if counts["blocks"] else 0.0
+        seconds = counts[f"{name}_seconds"]
+        row[f"{name}_blocks_per_s"] = counts["blocks"] / seconds if seconds else 0.0
+    return row
+
+
+def run_awgn_sweep(ebn0s, blocks, target_errors=0, seed=None, image_path=None, workers=None,
+                   r=3, extended=False):
+    code = HammingChannel(r, extended)
+    if not code.soft_decodable:
+        raise ValueError(f"{code.name}: la decodificación blanda necesita r <= 4")
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(ebn0s) * shards)
+
+    tasks = []
+    for i, ebn0 in enumerate(ebn0s):
+        per_shard = -(-blocks // shards)
+        shard_target = -(-target_errors // shards) if target_errors else 0
+        for j in range(shards):
+            tasks.append((ebn0, per_shard, shard_target, seeds[i * shards + j], image_path, r, extended))
+
+    totals = {ebn0: dict.fromkeys(AWGN_COUNTERS, 0) for ebn0 in ebn0s}
+    seconds = dict.fromkeys(ebn0s, 0.0)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for ebn0, counts, task_seconds in pool.map(simulate_awgn_task, tasks):
+            for key, value in counts.items():
+                totals[ebn0][key] += value
+            seconds[ebn0] += task_seconds
+
+    results = [summarize_awgn(ebn0, totals[ebn0], code.k) for ebn0 in ebn0s]
+    for row in results:
+        row["task_seconds"] = seconds[row["ebn0_db"]]
+    return results
+
+
+def crossing_ebn0(results, key, target):
+    # Eb/N0 (dB) en que la curva `key` baja de `target`, interpolando en log(BER)
+    points = [(row["ebn0_db"], row[key]) for row in sorted(results, key=lambda row: row["ebn0_db"])]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if y0 >= target > y1 > 0:
+            t = (math.log10(y0) - math.log10(target)) / (math.log10(y0) - math.log10(y1))
+            return x0 + t * (x1 - x0)
+    return None
+
+
+# =============================================================================
+# EXPORTACIÓN Y GRÁFICAS
+# =============================================================================
+def save_csv(results, path):
+    if not results:
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def save_json(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def plot_curves(results, path=None, code_name="Hamming (7,4)"):
+    import matplotlib
+    if path:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    probs = np.array([r["p"] for r in results])
+    ber = np.array([r["ber"] for r in results])
+    err = np.array([[r["ber"] - r["ber_low"] for r in results], [r["ber_high"] - r["ber"] for r in results]])
+
+    plt.figure(figsize=(8, 5))
+    plt.errorbar(probs, ber, yerr=err, marker="o", capsize=3, label=f"BER con {code_name}")
+    plt.plot(probs, [r["bler"] for r in results], marker="s", label="FER (bloques erróneos)")
+    plt.plot(probs, [r["channel_ber"] for r in results], "k--", label="BER del canal (sin código)")
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Probabilidad de ruido")
+    plt.ylabel("Tasa de error")
+    plt.title("Curvas BER / FER")
+    plt.grid(True, which="both", alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    if path:
+        plt.savefig(path, dpi=120)
+    else:
+        plt.show()
+
+
+def plot_awgn_curves(results, path=None, code_name="Hamming (7,4)"):
+    import matplotlib
+    if path:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ebn0 = np.array([r["ebn0_db"] for r in results])
+    plt.figure(figsize=(8, 5))
+    for name, label, marker in (("hard", "decisión dura (síndrome)", "o"), ("soft", "decisión blanda (ML)", "s")):
+        ber = np.array([r[f"{name}_ber"] for r in results])
+        err = np.array([[r[f"{name}_ber"] - r[f"{name}_ber_low"] for r in results],
+                        [r[f"{name}_ber_high"] - r[f"{name}_ber"] for r in results]])
+        plt.errorbar(ebn0, ber, yerr=err, marker=marker, capsize=3, label=f"{code_name}, {label}")
+    plt.plot(ebn0, [r["uncoded_ber"] for r in results], "k--", label="BPSK sin codificar (teórica)")
+    plt.yscale("log")
+    plt.xlabel("Eb/N0 (dB)")
+    plt.ylabel("BER")
+    plt.title("Canal AWGN: decodificación dura frente a blanda")
+    plt.grid(True, which="both", alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    if path:
+        plt.savefig(path, dpi=120)
+    else:
+        plt.show()
+
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido Monte Carlo de BER/FER para códigos Hamming")
+    parser.add_argument("--probs", type=float, nargs="+", default=list(np.logspace(-4, -1, 7)),
+                        help="probabilidades de ruido a simular")
+    parser.add_argument("--ebn0", type=float, nargs="+", default=None,
+                        help="barrer Eb/N0 (dB) en un canal AWGN comparando decodificación dura y blanda "
+                             "(en lugar de --probs/--model)")
+    parser.add_argument("--blocks", type=int, default=1_000_000, help="bloques por punto")
+    parser.add_argument("--model", choices=list(CHANNEL_KEYS), default="bsc")
+    parser.add_argument("--r", type=int, default=3, help="bits de paridad: código (2^r-1, 2^r-r-1)")
+    parser.add_argument("--extended", action="store_true", help="añadir paridad global (SECDED)")
+    parser.add_argument("--target-errors", type=int, default=0,
+                        help="detener un punto al llegar a este número de bits erróneos (0 = nunca)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--image", default=None, help="usar los píxeles de esta imagen como datos")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--plot", nargs="?", const="", default=None,
+                        help="dibujar las curvas (en pantalla, o en el archivo indicado)")
+    args = parser.parse_args(argv)
+
+    if args.ebn0:
+        return main_awgn(args)
+
+    results = run_sweep(args.probs, args.blocks, args.model, args.target_errors,
+                        args.seed, args.image, args.workers, args.r, args.extended)
+    code_name = HammingChannel(args.r, args.extended).name
+    print(code_name)
+
+    print(f"{'p':>10} {'bloques':>10} {'BER':>10} {'FER':>10} {'corr.':>9} {'mal corr.':>9} "
+          f"{'no corr.':>9} {'no det.':>8}")
+    for r in results:
+        print(f"{r['p']:>10.2e} {r['blocks']:>10} {r['ber']:>10.3e} {r['bler']:>10.3e} "
+              f"{r['corrected']:>9} {r['miscorrected']:>9} {r['uncorrectable']:>9} {r['undetected']:>8}")
+
+    if args.csv:
+        save_csv(results, args.csv)
+    if args.json:
+        save_json(results, args.json)
+    if args.plot is not None:
+        plot_curves(results, args.plot or None, code_name)
+
+
+def main_awgn(args):
+    results = run_awgn_sweep(args.ebn0, args.blocks, args.target_errors, args.seed, args.image,
+                             args.workers, args.r, args.extended)
+    code_name = HammingChannel(args.r, args.extended).name
+    print(f"{code_name}, canal AWGN (BPSK)")
+
+    print(f"{'Eb/N0':>7} {'bloques':>10} {'BER dura':>10} {'BER blanda':>10} {'sin cód.':>10} "
+          f"{'dura bl/s':>11} {'blanda bl/s':>11}")
+    for r in results:
+        print(f"{r['ebn0_db']:>7.2f} {r['blocks']:>10} {r['hard_ber']:>10.3e} {r['soft_ber']:>10.3e} "
+              f"{r['uncoded_ber']:>10.3e} {r['hard_blocks_per_s']:>11.3e} {r['soft_blocks_per_s']:>11.3e}")
+
+    target = 1e-4
+    hard, soft = crossing_ebn0(results, "hard_ber", target), crossing_ebn0(results, "soft_ber", target)
+    if hard is not None and soft is not None:
+        print(f"Ganancia de la decisión blanda a BER {target:g}: {hard - soft:.2f} dB")
+
+    if args.csv:
+        save_csv(results, args.csv)
+    if args.json:
+        save_json(results, args.json)
+    if args.plot is not None:
+        plot_awgn_curves(results, args.plot or None, code_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from proyecto import HammingChannel, AWGNChannel, BinarySymmetricChannel, stream_image_simulation
+
+# =============================================================================
+# BANCO DE PRUEBAS DE RENDIMIENTO (SIN INTERFAZ)
+# =============================================================================
+# Mide códec, canal y tubería de imagen; guarda los resultados en JSON y los
+# compara con una línea base para detectar caídas de rendimiento.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMAGES = [os.path.join(HERE, "test_image.png"), os.path.join(HERE, "luna.jpg")]
+DEFAULT_BASELINE = os.path.join(HERE, "benchmark_baseline.json")
+BLOCK_COUNTS = [1_000, 10_000, 100_000, 1_000_000]
+RESOLUTIONS = [150, 512, 1024, None]  # None = tamaño original
+NOISE_PROB = 0.01
+EBN0_DB = 5.0
+MIN_SAMPLE_SECONDS = 0.1  # cada muestra repite la prueba hasta durar al menos esto
+MIN_GATED_SECONDS = 0.005  # las pruebas más cortas se informan pero no cuentan como regresión
+
+
+def measure(func, repeat=3):
+    # Tiempo por llamada: mejor de `repeat` muestras, cada una con las llamadas
+    # necesarias para durar MIN_SAMPLE_SECONDS. El pico de memoria se mide aparte,
+    # en una ejecución sin cronometrar (tracemalloc ralentiza las reservas).
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    loops = max(1, int(MIN_SAMPLE_SECONDS / max(once, 1e-9)))
+
+    # Como timeit: sin recolector de basura durante las muestras
+    best = float("inf")
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            best = min(best, (time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def record(results, name, seconds, peak, blocks=None, nbytes=None):
+    entry = {"seconds": seconds, "peak_mb": peak / 2 ** 20}
+    if blocks is not None:
+        entry["blocks_per_s"] = blocks / seconds
+    if nbytes is not None:
+        entry["mb_per_s"] = nbytes / 2 ** 20 / seconds
+    results[name] = entry
+    rate = f"{entry['blocks_per_s']:>14,.0f} bloques/s" if blocks is not None else " " * 23
+    mb = f"{entry['mb_per_s']:>9.1f} MB/s" if nbytes is not None else " " * 14
+    print(f"{name:<42} {seconds * 1000:>10.2f} ms {rate} {mb} {entry['peak_mb']:>8.1f} MB pico")
+
+
+# -----------------------------------------------------------------------------
+# 1. CONVERSIONES DE BITS
+# -----------------------------------------------------------------------------
+def bench_bits(results, repeat):
+    hamming = HammingChannel()
+    values = list(range(256)) * 40
+    bits = [hamming.text_to_bits(v, 8) for v in values]
+
+    seconds, peak = measure(lambda: [hamming.text_to_bits(v, 8) for v in values], repeat)
+    record(results, "text_to_bits (x10240)", seconds, peak, nbytes=len(values))
+    seconds, peak = measure(lambda: [hamming.bits_to_text(b) for b in bits], repeat)
+    record(results, "bits_to_text (x10240)", seconds, peak, nbytes=len(values))
+
+
+# -----------------------------------------------------------------------------
+# 2. CÓDEC Y CANAL POR NÚMERO DE BLOQUES
+# -----------------------------------------------------------------------------
+def bench_codec(results, block_counts, repeat):
+    hamming = HammingChannel(seed=0)
+    channel = BinarySymmetricChannel(NOISE_PROB)
+    for count in block_counts:
+        nbytes = count * hamming.k // 8
+        data = hamming.rng.integers(0, 2, size=(count, hamming.k), dtype=np.uint8)
+        encoded = hamming.encode_blocks(data)
+        received, _ = hamming.transmit(encoded, channel)
+
+        seconds, peak = measure(lambda: hamming.encode_blocks(data), repeat)
+        record(results, f"encode_blocks [{count}]", seconds, peak, count, nbytes)
+        seconds, peak = measure(lambda: hamming.transmit(encoded, channel), repeat)
+        record(results, f"canal BSC [{count}]", seconds, peak, count, nbytes)
+        seconds, peak = measure(lambda: hamming.decode_blocks(received), repeat)
+        record(results, f"decode_blocks [{count}]", seconds, peak, count, nbytes)
+
+        # Formato compacto con tablas (dos códigos por byte)
+        raw = hamming.rng.integers(0, 256, size=count // 2, dtype=np.uint8)
+        codes = hamming.encode_bytes_packed(raw)
+        seconds, peak = measure(lambda: hamming.encode_bytes_packed(raw), repeat)
+        record(results, f"encode_bytes_packed [{count}]", seconds, peak, len(codes), raw.nbytes)
+        seconds, peak = measure(lambda: hamming.decode_bytes_packed(codes), repeat)
+        record(results, f"decode_bytes_packed [{count}]", seconds, peak, len(codes), raw.nbytes)
+
+        # Canal AWGN: decisión dura (síndrome) frente a blanda (máxima verosimilitud)
+        samples = AWGNChannel.for_code(hamming, EBN0_DB).soft_apply(encoded, hamming.rng)
+        seconds, peak = measure(lambda: hamming.decode_hard(samples), repeat)
+        record(results, f"decode_hard AWGN [{count}]", seconds, peak, count, nbytes)
+        seconds, peak = measure(lambda: hamming.decode_soft(samples), repeat)
+        record(results, f"decode_soft AWGN [{count}]", seconds, peak, count, nbytes)
+
+
+# -----------------------------------------------------------------------------
+# 3. TUBERÍA DE IMAGEN COMPLETA
+# -----------------------------------------------------------------------------
+def image_pipeline(hamming, path, side):
+    # Lectura + escala de grises + redimensionado + codificar + canal + decodificar
+    with Image.open(path) as img:
+        img = img.convert("L")
+        if side is not None:
+            img = img.resize((side, side))
+        pixels = np.asarray(img).ravel()
+    codes = hamming.encode_bytes(pixels)
+    received, _ = hamming.transmit_codes(codes, BinarySymmetricChannel(NOISE_PROB))
+    return hamming.decode_bytes(received, pixels.size)
+
+
+def bench_images(results, images, resolutions, repeat):
+    hamming = HammingChannel(seed=0)
+    for path in images:
+        name = os.path.basename(path)
+        with Image.open(path) as img:
+            native = img.size
+        for side in resolutions:
+            width, height = (side, side) if side is not None else native
+            pixels = width * height
+            label = f"{side}x{side}" if side is not None else f"{width}x{height} (original)"
+            seconds, peak = measure(lambda: image_pipeline(hamming, path, side), repeat)
+            record(results, f"imagen {name} {label}", seconds, peak, 2 * pixels, pixels)
+
+        # Modo por franjas a resolución completa, escribiendo las salidas PGM
+        with tempfile.TemporaryDirectory() as tmp:
+            out_noisy, out_corr = os.path.join(tmp, "n.pgm"), os.path.join(tmp, "c.pgm")
+            pixels = native[0] * native[1]
+            seconds, peak = measure(lambda: stream_image_simulation(
+                hamming, path, BinarySymmetricChannel(NOISE_PROB), out_noisy, out_corr), repeat)
+            record(results, f"franjas {name} {native[0]}x{native[1]}", seconds, peak, 2 * pixels, pixels)
+
+
+# -----------------------------------------------------------------------------
+# 4. COMPARACIÓN CON LA LÍNEA BASE
+# -----------------------------------------------------------------------------
+def compare(results, baseline, tolerance):
+    # Una prueba es regresión si tarda más de (1 + tolerance) veces lo que marca la base.
+    # Las que duran menos de MIN_GATED_SECONDS quedan dentro del ruido de medida.
+    regressions = []
+    for name, entry in results.items():
+        old = baseline.get(name)
+        if old is None or old["seconds"] < MIN_GATED_SECONDS:
+            continue
+        ratio = entry["seconds"] / old["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del códec Hamming, el canal y la tubería de imagen")
+    parser.add_argument("--output", default="benchmark_results.json", help="archivo JSON de resultados")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON de referencia para comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="guardar estos resultados como línea base")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="margen de tiempo permitido frente a la base (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="menos tamaños (para pruebas rápidas)")
+    args = parser.parse_args(argv)
+
+    block_counts = BLOCK_COUNTS[:2] if args.quick else BLOCK_COUNTS
+    resolutions = RESOLUTIONS[:1] if args.quick else RESOLUTIONS
+    images = IMAGES[:1] if args.quick else IMAGES
+
+    results = {}
+    bench_bits(results, args.repeat)
+    bench_codec(results, block_counts, args.repeat)
+    bench_images(results, images, resolutions, args.repeat)
+
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sin línea base para comparar (usa --save-baseline).")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"Sin regresiones frente a {args.baseline} (tolerancia {args.tolerance:.0%}).")
+        return 0
+    print(f"\n¡{len(regressions)} REGRESIONES frente a {args.baseline}!")
+    for name, ratio in regressions:
+        print(f"  {name:<42} {ratio:.2f}x más lento")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
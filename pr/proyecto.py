@@ -1,35 +1,138 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from PIL import Image
-import random
+import argparse
+import os
+import queue
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+
+# Las bibliotecas de interfaz (tkinter, matplotlib) se importan solo al abrir la
+# GUI: el modo consola arranca sin pagar su coste. PIL se importa donde se usa.
+tk = ttk = filedialog = messagebox = None
+FigureCanvasTkAgg = ListedColormap = Figure = None
+
+
+def import_gui():
+    global tk, ttk, filedialog, messagebox, FigureCanvasTkAgg, ListedColormap, Figure
+    if tk is not None:
+        return
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.colors import ListedColormap
+    from matplotlib.figure import Figure
 
 # =============================================================================
 # 1. MOTOR LÓGICO (CEREBRO MATEMÁTICO)
 # =============================================================================
+def hamming_matrices(r=3, extended=False):
+    # G (k x n) y H (n-k x n) sistemáticos de Hamming(2^r-1, 2^r-r-1): datos primero,
+    # paridad después. Las columnas de datos de H son los vectores de r bits con peso
+    # >= 2 (por peso y de mayor a menor), así r=3 da las matrices clásicas (7,4).
+    # Con extended=True se añade un bit de paridad global (SECDED).
+    n, k = 2 ** r - 1, 2 ** r - r - 1
+    values = sorted((v for v in range(1, 2 ** r) if bin(v).count("1") >= 2),
+                    key=lambda v: (bin(v).count("1"), -v))
+    data_cols = (np.array(values)[None, :] >> np.arange(r - 1, -1, -1)[:, None]) & 1
+
+    G = np.hstack([np.eye(k, dtype=np.int64), data_cols.T])
+    H = np.hstack([data_cols, np.eye(r, dtype=np.int64)])
+    if extended:
+        G = np.hstack([G, G.sum(axis=1, keepdims=True) % 2])
+        H = np.vstack([np.hstack([H, np.zeros((r, 1), dtype=np.int64)]),
+                       np.ones((1, n + 1), dtype=np.int64)])
+    return G, H
+
+
+# Decodificación blanda: se compara con los 2^k códigos, así que solo para k pequeño
+SOFT_MAX_K = 11
+SOFT_CHUNK = 1 << 22  # elementos de la matriz de correlaciones por trozo (16 MB en float32)
+
+
 class HammingChannel:
-    def __init__(self):
-        # Matriz Generadora G (4x7)
-        self.G = np.array([
-            [1, 0, 0, 0, 1, 1, 0],
-            [0, 1, 0, 0, 1, 0, 1],
-            [0, 0, 1, 0, 0, 1, 1],
-            [0, 0, 0, 1, 1, 1, 1]
-        ])
-
-        # Matriz de Paridad H (3x7)
-        self.H = np.array([
-            [1, 1, 0, 1, 1, 0, 0],
-            [1, 0, 1, 1, 0, 1, 0],
-            [0, 1, 1, 1, 0, 0, 1]
-        ])
-        
+    # Tablas precalculadas por código (r, extendido): se generan una sola vez
+    _tables = {}
+
+    def __init__(self, r=3, extended=False, seed=None):
+        if not 2 <= r <= 10:
+            raise ValueError("r debe estar entre 2 y 10")
+        # Generador propio: con semilla, cada simulación es reproducible
+        self.rng = np.random.default_rng(seed)
+
+        self.r = r
+        self.extended = extended
+        self.n = 2 ** r - 1 + int(extended)
+        self.k = 2 ** r - r - 1
+        # Formato compacto (un uint8 por código, dos códigos por byte): k = 4 y n <= 8
+        self.packed = self.k == 4
+
+        key = (r, extended)
+        if key not in HammingChannel._tables:
+            HammingChannel._tables[key] = self._build_tables()
+        self.__dict__.update(HammingChannel._tables[key])
+
+    @property
+    def name(self):
+        return f"Hamming ({self.n},{self.k})" + (" SECDED" if self.extended else "")
+
+    def _build_tables(self):
+        tables = {}
+
+        # Matriz Generadora G (k x n) y Matriz de Paridad H (n-k x n)
+        G, H = hamming_matrices(self.r, self.extended)
+        tables["G"], tables["H"] = G, H
+
         # Mapeo de Síndrome
-        self.syndrome_map = {}
-        for i in range(7):
-            col = tuple(self.H[:, i])
-            self.syndrome_map[col] = i
+        tables["syndrome_map"] = {tuple(H[:, i]): i for i in range(self.n)}
+
+        # Tabla síndrome -> posición para el modo por lotes.
+        # El índice es el síndrome leído como entero binario; -1 = sin error, o
+        # (en SECDED) error doble detectado que no se puede corregir.
+        weights = (1 << np.arange(H.shape[0] - 1, -1, -1)).astype(np.uint16)
+        syndrome_pos = np.full(2 ** H.shape[0], -1, dtype=np.int64)
+        syndrome_pos[H.T @ weights] = np.arange(self.n)
+        tables["syndrome_weights"], tables["syndrome_pos"] = weights, syndrome_pos
+
+        # Copias en float32: el producto pasa por BLAS y es exacto (sumas pequeñas)
+        tables["_G_f"] = G.astype(np.float32)
+        tables["_Ht_f"] = H.T.astype(np.float32)
+        self.__dict__.update(tables)
+
+        if self.k <= SOFT_MAX_K:
+            # Libro de códigos para la decodificación blanda: fila i = dato i (bit alto
+            # primero) y su código en BPSK (0 -> +1, 1 -> -1), ya traspuesto (n x 2^k)
+            values = np.arange(2 ** self.k)
+            tables["codebook_data"] = ((values[:, None] >> np.arange(self.k - 1, -1, -1)) & 1).astype(np.uint8)
+            codebook = self.encode_blocks(tables["codebook_data"])
+            tables["_codebook_bpsk"] = np.ascontiguousarray((1 - 2 * codebook.astype(np.float32)).T)
+
+        if self.packed:
+            # Formato compacto: cada código de n bits en un uint8 (bit 0 = el más alto)
+            tables["code_weights"] = (1 << np.arange(self.n - 1, -1, -1)).astype(np.uint8)
+            self.code_weights = tables["code_weights"]
+            all_data = np.unpackbits(np.arange(2 ** self.k, dtype=np.uint8)[:, None], axis=1)[:, 8 - self.k:]
+            tables["encode_table"] = self.pack_codewords(self.encode_blocks(all_data))
+
+            # Tabla de 2^n entradas: código recibido -> dato corregido / posición del error
+            all_codes = np.unpackbits(np.arange(2 ** self.n, dtype=np.uint8)[:, None], axis=1)[:, 8 - self.n:]
+            decoded, detected, _, pos = self.decode_blocks(all_codes)
+            data_weights = (1 << np.arange(self.k - 1, -1, -1)).astype(np.uint8)
+            tables["decode_table"] = (decoded @ data_weights).astype(np.uint8)
+            tables["error_table"] = detected
+            tables["error_pos_table"] = pos.astype(np.int8)
+            tables["syndrome_table"] = self._gf2_dot(all_codes, tables["_Ht_f"]) @ weights
+
+        for value in tables.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+        return tables
 
     def text_to_bits(self, value, num_bits):
         return [int(x) for x in format(value, f'0{num_bits}b')]
@@ -37,13 +140,13 @@ class HammingChannel:
     def bits_to_text(self, bits):
         return int("".join(str(x) for x in bits), 2)
 
-    def encode_block(self, nibble_4bits):
-        msg_vector = np.array(nibble_4bits)
+    def encode_block(self, data_bits):
+        msg_vector = np.array(data_bits)
         encoded = np.dot(msg_vector, self.G) % 2
         return encoded.astype(int)
 
-    def decode_block(self, received_7bits):
-        r_vector = np.array(received_7bits)
+    def decode_block(self, received_bits):
+        r_vector = np.array(received_bits)
         syndrome = np.dot(self.H, r_vector) % 2
         
         error_detected = False
@@ -57,169 +160,1309 @@ class HammingChannel:
                 error_pos = self.syndrome_map[syndrome_tuple]
                 corrected_vector[error_pos] = 1 - corrected_vector[error_pos]
         
-        decoded_data = corrected_vector[:4]
+        decoded_data = corrected_vector[:self.k]
         return decoded_data, error_detected, syndrome, error_pos
 
     def simulate_noise(self, encoded_msg, error_prob):
-        noisy_msg = encoded_msg.copy()
-        if random.random() < error_prob:
-            bit_to_flip = random.randint(0, 6)
-            noisy_msg[bit_to_flip] = 1 - noisy_msg[bit_to_flip]
-        return noisy_msg
+        noisy_msg, _ = SingleErrorChannel(error_prob).apply(np.reshape(encoded_msg, (1, -1)), self.rng)
+        return noisy_msg[0].astype(int)
+
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    # -------------------------------------------------------------------------
+    # MODO POR LOTES (VECTORIZADO): trabaja con matrices N x k / N x n
+    # -------------------------------------------------------------------------
+    def _gf2_dot(self, a, b_f):
+        # Producto de matrices en GF(2)
+        return (a.astype(np.float32) @ b_f).astype(np.uint8) & 1
+
+    def encode_blocks(self, data_blocks):
+        msgs = np.asarray(data_blocks, dtype=np.uint8).reshape(-1, self.k)
+        return self._gf2_dot(msgs, self._G_f)
+
+    def decode_blocks(self, received):
+        # Todos los síndromes con un solo producto de matrices
+        r = np.asarray(received, dtype=np.uint8).reshape(-1, self.n)
+        syndromes = self._gf2_dot(r, self._Ht_f)
+        syndrome_idx = syndromes @ self.syndrome_weights
+
+        error_detected = syndrome_idx != 0
+        error_pos = self.syndrome_pos[syndrome_idx]
+
+        corrected = r.copy()
+        rows = np.flatnonzero(error_pos >= 0)
+        corrected[rows, error_pos[rows]] ^= 1
+
+        return corrected[:, :self.k], error_detected, syndromes, error_pos
+
+    def transmit(self, encoded_blocks, channel):
+        # Pasa N códigos por el canal; devuelve (recibidos, máscara de errores)
+        return channel.apply(encoded_blocks, self.rng)
+
+    # -------------------------------------------------------------------------
+    # FORMATO COMPACTO (uint8 por código) CON TABLAS DE CONSULTA (solo r = 3)
+    # -------------------------------------------------------------------------
+    def pack_codewords(self, blocks):
+        return np.asarray(blocks, dtype=np.uint8).reshape(-1, self.n) @ self.code_weights
+
+    def unpack_codewords(self, codes):
+        codes = np.asarray(codes, dtype=np.uint8).ravel()
+        return np.unpackbits(codes[:, None], axis=1)[:, 8 - self.n:]
+
+    def encode_packed(self, nibble_values):
+        return self.encode_table[np.asarray(nibble_values, dtype=np.uint8)]
+
+    def decode_packed(self, codes):
+        codes = np.asarray(codes, dtype=np.uint8)
+        return self.decode_table[codes], self.error_table[codes], self.error_pos_table[codes]
+
+    def encode_bytes_packed(self, data):
+        # Cada byte -> dos códigos (nibble alto, nibble bajo)
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        codes = np.empty(2 * len(data), dtype=np.uint8)
+        codes[0::2] = self.encode_table[data >> 4]
+        codes[1::2] = self.encode_table[data & 0x0F]
+        return codes
+
+    def decode_bytes_packed(self, codes):
+        nibbles, detected, _ = self.decode_packed(codes)
+        data = (nibbles[0::2] << 4) | nibbles[1::2]
+        return data, detected
+
+    def packed_data_bytes(self, codes):
+        # Bytes "tal cual llegaron" (bits de datos sin corregir)
+        codes = np.asarray(codes, dtype=np.uint8)
+        shift = self.n - self.k
+        return ((codes[0::2] >> shift) << 4) | (codes[1::2] >> shift)
+
+    def transmit_packed(self, codes, channel):
+        # Igual que transmit, con códigos empaquetados; la máscara también va en uint8
+        return channel.apply_packed(codes, self.n, self.rng)
+
+    # -------------------------------------------------------------------------
+    # BYTES <-> CÓDIGOS PARA CUALQUIER CÓDIGO (compacto si r = 3, matriz si no)
+    # -------------------------------------------------------------------------
+    def bytes_to_blocks(self, data):
+        # Bytes -> bloques de datos: valores de nibble (compacto) o matriz N x k de bits
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        if self.packed:
+            nibbles = np.empty(2 * len(data), dtype=np.uint8)
+            nibbles[0::2] = data >> 4
+            nibbles[1::2] = data & 0x0F
+            return nibbles
+        bits = np.unpackbits(data)
+        return np.pad(bits, (0, -len(bits) % self.k)).reshape(-1, self.k)
+
+    def encode_data_blocks(self, blocks):
+        return self.encode_packed(blocks) if self.packed else self.encode_blocks(blocks)
+
+    def encode_bytes(self, data):
+        # Igual que encode_data_blocks(bytes_to_blocks(data)), sin el paso intermedio si r = 3
+        if self.packed:
+            return self.encode_bytes_packed(data)
+        return self.encode_blocks(self.bytes_to_blocks(data))
+
+    def transmit_interleaved(self, blocks, channel, interleaver):
+        # Entrelaza (vista sin copia), pasa por el canal y desentrelaza; recibidos y
+        # máscara de errores vuelven en el orden original de los códigos.
+        if channel.per_block:
+            # Máscara por código: entrelazarla y desentrelazarla la deja igual
+            return self.transmit(blocks, channel)
+        noisy, mask = self.transmit(interleaver.interleave(blocks), channel)
+        return interleaver.deinterleave(noisy, len(blocks)), interleaver.deinterleave(mask, len(blocks))
+
+    def transmit_codes(self, codes, channel, interleaver=None):
+        if interleaver is not None:
+            # El entrelazado es a nivel de bit: los códigos compactos se expanden
+            blocks = self.unpack_codewords(codes) if self.packed else codes
+            noisy, mask = self.transmit_interleaved(blocks, channel, interleaver)
+            if self.packed:
+                return self.pack_codewords(noisy), self.pack_codewords(mask)
+            return noisy, mask
+        if self.packed:
+            return self.transmit_packed(codes, channel)
+        return self.transmit(codes, channel)
+
+    def decode_bytes(self, codes, nbytes):
+        # Devuelve (bytes corregidos, error detectado por bloque)
+        if self.packed:
+            return self.decode_bytes_packed(codes)
+        decoded, detected, _, _ = self.decode_blocks(codes)
+        return np.packbits(decoded.ravel()[:8 * nbytes]), detected
+
+    def received_data_bytes(self, codes, nbytes):
+        # Bytes "tal cual llegaron" (bits de datos sin corregir)
+        if self.packed:
+            return self.packed_data_bytes(codes)
+        data_bits = np.ascontiguousarray(codes[:, :self.k])
+        return np.packbits(data_bits.ravel()[:8 * nbytes])
+
+    def count_flips(self, flips):
+        return int(np.unpackbits(flips).sum()) if self.packed else int(flips.sum())
+
+    # -------------------------------------------------------------------------
+    # DIAGNÓSTICO DE LA DECODIFICACIÓN (para la instrumentación)
+    # -------------------------------------------------------------------------
+    def syndrome_indices(self, codes):
+        # Síndrome de cada código recibido leído como entero (0 = sin error).
+        # Acepta códigos compactos (1-D, uint8) o la matriz N x n.
+        codes = np.asarray(codes, dtype=np.uint8)
+        if codes.ndim == 1:
+            return self.syndrome_table[codes]
+        return self._gf2_dot(codes, self._Ht_f) @ self.syndrome_weights
+
+    def residual_data_errors(self, flips, error_pos):
+        # Bits de DATOS que siguen mal en cada código después de la corrección del
+        # decodificador (lo mismo que contar decodificado != enviado)
+        rows = np.flatnonzero(error_pos >= 0)
+        if flips.ndim == 1:
+            residual = np.array(flips, dtype=np.uint8)
+            residual[rows] ^= self.code_weights[error_pos[rows]]
+            return np.unpackbits((residual >> (self.n - self.k))[:, None], axis=1).sum(axis=1)
+        weights = flips[:, :self.k].sum(axis=1, dtype=np.int64)
+        rows = rows[error_pos[rows] < self.k]
+        weights[rows] += 1 - 2 * flips[rows, error_pos[rows]].astype(np.int64)
+        return weights
+
+    # -------------------------------------------------------------------------
+    # DECODIFICACIÓN DURA / BLANDA SOBRE MUESTRAS BPSK (canal AWGN)
+    # -------------------------------------------------------------------------
+    @property
+    def soft_decodable(self):
+        return self.k <= SOFT_MAX_K
+
+    def hard_decisions(self, samples):
+        # Umbral en 0: muestra negativa -> bit 1
+        return (np.asarray(samples).reshape(-1, self.n) < 0).astype(np.uint8)
+
+    def decode_hard(self, samples):
+        # Decisión dura y decodificación por síndrome; devuelve los datos (N x k)
+        hard = self.hard_decisions(samples)
+        if self.packed:
+            return self.codebook_data[self.decode_table[self.pack_codewords(hard)]]
+        return self.decode_blocks(hard)[0]
+
+    def decode_soft(self, samples, chunk=SOFT_CHUNK):
+        # Máxima verosimilitud en AWGN: el código más cercano en distancia euclídea es
+        # el de mayor correlación con la muestra recibida. Se correlaciona cada vector
+        # con los 2^k códigos en un solo producto de matrices, por trozos de como
+        # mucho `chunk` correlaciones para acotar la memoria.
+        if not self.soft_decodable:
+            raise ValueError(f"{self.name}: decodificación blanda solo para k <= {SOFT_MAX_K}")
+        y = np.asarray(samples, dtype=np.float32).reshape(-1, self.n)
+        rows = max(1, chunk // self._codebook_bpsk.shape[1])
+        best = np.empty(len(y), dtype=np.intp)
+        for start in range(0, len(y), rows):
+            np.argmax(y[start:start + rows] @ self._codebook_bpsk, axis=1, out=best[start:start + rows])
+        return self.codebook_data[best]
+
+
+def decode_outcomes(hit, detected, error_pos, bit_errors):
+    # Clasificación de cada bloque tras decodificar, común a la interfaz, la consola
+    # y el barrido. Se mira a nivel de datos: corregido = llegó con errores y los
+    # datos salen bien; mal corregido = se corrigió una posición y los datos siguen mal.
+    # Las cuatro clases (con no corregible y no detectado) reparten blocks_hit sin solaparse.
+    wrong = bit_errors != 0
+    return {
+        "blocks_hit": int(hit.sum()),
+        "corrected": int((hit & detected & (error_pos >= 0) & ~wrong).sum()),
+        "miscorrected": int((detected & wrong & (error_pos >= 0)).sum()),
+        "uncorrectable": int((detected & (error_pos < 0)).sum()),
+        "undetected": int((hit & ~detected).sum()),
+        "residual_bit_errors": int(bit_errors.sum()),
+    }
+
+
+# Códigos disponibles en la interfaz: nombre -> r
+HAMMING_CODES = {
+    "(7,4)": 3,
+    "(15,11)": 4,
+    "(31,26)": 5,
+    "(63,57)": 6,
+}
+
+
+# =============================================================================
+# MODELOS DE CANAL (RUIDO VECTORIZADO CON np.random.Generator)
+# =============================================================================
+PACKED_CHUNK = 1 << 16  # códigos por trozo al generar errores en formato compacto
+
+
+class NoiseChannel:
+    # Cada modelo genera una máscara de errores (N x n, 0/1) para N códigos de n bits.
+    # per_block = True: los errores se definen por código (no por posición en la
+    # línea), así que la máscara se sortea siempre en unidades de código.
+    per_block = False
+
+    def error_mask(self, num_blocks, n, rng):
+        raise NotImplementedError
+
+    def apply(self, blocks, rng):
+        # Los bits se transmiten en el orden lógico del array (vale para vistas
+        # entrelazadas de más de 2 dimensiones); el último eje hace de "bloque",
+        # por eso los modelos per_block no deben recibir vistas entrelazadas.
+        blocks = np.asarray(blocks, dtype=np.uint8)
+        n = blocks.shape[-1]
+        mask = self.error_mask(blocks.size // n, n, rng).reshape(blocks.shape)
+        return blocks ^ mask, mask
+
+    def apply_packed(self, codes, n, rng):
+        # La máscara N x n se genera por trozos de PACKED_CHUNK códigos: la memoria
+        # extra queda acotada y solo crece el uint8 de errores por código. Los trozos
+        # van en orden, así que el flujo aleatorio (y el estado de las ráfagas) es
+        # el mismo que con una sola máscara.
+        codes = np.asarray(codes, dtype=np.uint8).ravel()
+        weights = (1 << np.arange(n - 1, -1, -1)).astype(np.uint8)
+        flips = np.empty(len(codes), dtype=np.uint8)
+        for start in range(0, len(codes), PACKED_CHUNK):
+            count = min(PACKED_CHUNK, len(codes) - start)
+            flips[start:start + count] = self.error_mask(count, n, rng) @ weights
+        return codes ^ flips, flips
+
+
+class BinarySymmetricChannel(NoiseChannel):
+    # Canal binario simétrico: cada bit se invierte con probabilidad p
+    def __init__(self, error_prob):
+        self.error_prob = error_prob
+
+    def error_mask(self, num_blocks, n, rng):
+        return (rng.random((num_blocks, n)) < self.error_prob).astype(np.uint8)
+
+
+class SingleErrorChannel(NoiseChannel):
+    # Modelo original: con probabilidad p se invierte UN bit al azar del bloque
+    per_block = True
+
+    def __init__(self, error_prob):
+        self.error_prob = error_prob
+
+    def error_mask(self, num_blocks, n, rng):
+        mask = np.zeros((num_blocks, n), dtype=np.uint8)
+        rows = np.flatnonzero(rng.random(num_blocks) < self.error_prob)
+        mask[rows, rng.integers(0, n, size=len(rows))] = 1
+        return mask
+
+    def apply_packed(self, codes, n, rng):
+        # Atajo sin pasar por la máscara N x n
+        codes = np.asarray(codes, dtype=np.uint8).ravel()
+        flips = np.zeros(len(codes), dtype=np.uint8)
+        rows = np.flatnonzero(rng.random(len(codes)) < self.error_prob)
+        flips[rows] = 1 << rng.integers(0, n, size=len(rows)).astype(np.uint8)
+        return codes ^ flips, flips
+
+
+class GilbertElliottChannel(NoiseChannel):
+    # Canal de ráfagas de dos estados (Bueno/Malo) que evoluciona bit a bit.
+    # El estado se conserva entre llamadas para que un flujo por trozos sea continuo.
+    def __init__(self, p_good_to_bad, p_bad_to_good, error_good=0.0, error_bad=0.5):
+        self.p_good_to_bad = p_good_to_bad
+        self.p_bad_to_good = p_bad_to_good
+        self.error_good = error_good
+        self.error_bad = error_bad
+        self.bad = False
+
+    @classmethod
+    def from_error_rate(cls, error_prob, burst_length=8, error_bad=0.5):
+        # Ajusta las transiciones para que la tasa media de bits erróneos sea error_prob
+        p_bad_to_good = 1.0 / burst_length
+        frac_bad = min(error_prob / error_bad, 0.999)
+        p_good_to_bad = frac_bad * p_bad_to_good / (1.0 - frac_bad)
+        return cls(min(p_good_to_bad, 1.0), p_bad_to_good, 0.0, error_bad)
+
+    def reset(self):
+        self.bad = False
+
+    def _run_lengths(self, p, size, total, rng):
+        if p <= 0:
+            return np.full(size, total + 1, dtype=np.int64)
+        return rng.geometric(p, size=size)
+
+    def states(self, total, rng):
+        # Secuencia de estados (True = Malo) para `total` bits, generada por tramos
+        mean_good = 1.0 / self.p_good_to_bad if self.p_good_to_bad > 0 else total + 1
+        mean_bad = 1.0 / self.p_bad_to_good if self.p_bad_to_good > 0 else total + 1
+        pairs = int(total / (mean_good + mean_bad)) + 16
+
+        runs, covered, bad = [], 0, self.bad
+        while covered < total:
+            first = self._run_lengths(self.p_bad_to_good if bad else self.p_good_to_bad, pairs, total, rng)
+            second = self._run_lengths(self.p_good_to_bad if bad else self.p_bad_to_good, pairs, total, rng)
+            chunk = np.empty(2 * pairs, dtype=np.int64)
+            chunk[0::2], chunk[1::2] = first, second
+            runs.append(chunk)
+            covered += int(min(chunk.sum(), total + 1))
+        lengths = np.concatenate(runs)
+        ends = np.cumsum(lengths)
+        last = int(np.searchsorted(ends, total))
+
+        labels = np.zeros(len(lengths), dtype=bool)
+        labels[(0 if self.bad else 1)::2] = True
+        states = np.repeat(labels[:last + 1], lengths[:last + 1])[:total]
+
+        # Si el último tramo termina justo en el límite, el siguiente bit cambia de estado
+        self.bad = bool(labels[last]) != bool(ends[last] == total)
+        return states
+
+    def error_mask(self, num_blocks, n, rng):
+        total = num_blocks * n
+        if total == 0:
+            return np.zeros((num_blocks, n), dtype=np.uint8)
+        probs = np.where(self.states(total, rng), self.error_bad, self.error_good)
+        return (rng.random(total) < probs).astype(np.uint8).reshape(num_blocks, n)
+
+
+class AWGNChannel(NoiseChannel):
+    # Canal gaussiano con modulación BPSK (0 -> +1, 1 -> -1). El parámetro es Eb/N0
+    # en dB por bit de DATOS: con tasa R = k/n, sigma^2 = 1 / (2 R Eb/N0).
+    def __init__(self, ebn0_db, rate=1.0):
+        self.ebn0_db = ebn0_db
+        self.rate = rate
+        self.sigma = float(np.sqrt(1.0 / (2.0 * rate * 10 ** (ebn0_db / 10))))
+
+    @classmethod
+    def for_code(cls, hamming, ebn0_db):
+        return cls(ebn0_db, hamming.k / hamming.n)
+
+    def soft_apply(self, blocks, rng):
+        # Muestras recibidas (float32, misma forma que blocks) para la decodificación blanda
+        blocks = np.asarray(blocks, dtype=np.uint8)
+        noise = rng.standard_normal(blocks.shape, dtype=np.float32)
+        noise *= np.float32(self.sigma)
+        noise += 1 - 2 * blocks.astype(np.float32)
+        return noise
+
+    def error_mask(self, num_blocks, n, rng):
+        # Decisión dura: el bit cambia si el ruido cruza el umbral (BSC con p = Q(1/sigma))
+        return (rng.standard_normal((num_blocks, n), dtype=np.float32) * np.float32(self.sigma) < -1).astype(np.uint8)
+
+    def bit_error_prob(self):
+        # Probabilidad de error por bit tras la decisión dura: Q(1/sigma)
+        return 0.5 * math.erfc(1.0 / (self.sigma * math.sqrt(2.0)))
+
+
+def uncoded_ber(ebn0_db):
+    # BER teórica de BPSK sin codificar: Q(sqrt(2 Eb/N0))
+    return 0.5 * math.erfc(math.sqrt(10 ** (ebn0_db / 10)))
+
+
+CHANNEL_MODELS = {
+    "Un bit por bloque": SingleErrorChannel,
+    "BSC (por bit)": BinarySymmetricChannel,
+    "Ráfagas (Gilbert-Elliott)": GilbertElliottChannel.from_error_rate,
+}
+
+
+# Nombres cortos para la línea de comandos y los scripts
+CHANNEL_KEYS = {
+    "single": "Un bit por bloque",
+    "bsc": "BSC (por bit)",
+    "gilbert": "Ráfagas (Gilbert-Elliott)",
+}
+
+
+def make_channel(model, error_prob):
+    return CHANNEL_MODELS[CHANNEL_KEYS.get(model, model)](error_prob)
+
+
+# =============================================================================
+# ENTRELAZADO POR BLOQUES (RESISTENCIA A RÁFAGAS)
+# =============================================================================
+class BlockInterleaver:
+    # Se escriben `depth` códigos por filas y se transmiten por columnas: una
+    # ráfaga de hasta `depth` bits seguidos toca cada código como mucho una vez.
+    def __init__(self, depth):
+        if depth < 1:
+            raise ValueError("La profundidad del entrelazado debe ser >= 1")
+        self.depth = depth
+
+    def interleave(self, blocks):
+        # (N, n) -> vista (N/depth, n, depth) sin copiar. Solo se copia para
+        # rellenar con ceros cuando N no es múltiplo de la profundidad.
+        blocks = np.asarray(blocks, dtype=np.uint8)
+        pad = -len(blocks) % self.depth
+        if pad:
+            blocks = np.concatenate([blocks, np.zeros((pad, blocks.shape[1]), dtype=np.uint8)])
+        return blocks.reshape(-1, self.depth, blocks.shape[1]).transpose(0, 2, 1)
+
+    def deinterleave(self, frames, num_blocks):
+        n = frames.shape[1]
+        return frames.transpose(0, 2, 1).reshape(-1, n)[:num_blocks]
+
+
+def compare_interleaving(hamming, data, channel_factory, depth, seed=None):
+    # Mismos datos y misma realización del canal (misma semilla), con y sin
+    # entrelazado. channel_factory() debe crear un canal nuevo en cada llamada.
+    if seed is None:
+        seed = int(hamming.rng.integers(2 ** 63))
+    codes = hamming.encode_bytes(data)
+    blocks = hamming.unpack_codewords(codes) if hamming.packed else codes
+    sent = blocks[:, :hamming.k]
+    count = len(blocks)
+
+    # El relleno hasta un múltiplo de la profundidad se añade a las dos pasadas:
+    # así ambas transmiten los mismos bits y solo cambia el orden en la línea
+    pad = -count % depth
+    if pad:
+        blocks = np.concatenate([blocks, np.zeros((pad, blocks.shape[1]), dtype=np.uint8)])
+
+    results = {}
+    for label, interleaver in (("sin entrelazado", None), (f"entrelazado x{depth}", BlockInterleaver(depth))):
+        hamming.reseed(seed)
+        channel = channel_factory()
+        if interleaver is None:
+            received, mask = hamming.transmit(blocks, channel)
+        else:
+            received, mask = hamming.transmit_interleaved(blocks, channel, interleaver)
+        received, mask = received[:count], mask[:count]
+        decoded, detected, _, pos = hamming.decode_blocks(received)
+
+        bit_errors = (decoded != sent).sum(axis=1)
+        results[label] = {
+            "channel_bit_errors": int(mask.sum()),
+            **decode_outcomes(mask.any(axis=1), detected, pos, bit_errors),
+            "residual_ber": float(bit_errors.sum() / sent.size) if sent.size else 0.0,
+        }
+    return results
+
+
+def compare_decoders(hamming, data, ebn0_db, seed=None):
+    # Decodificación dura (síndrome) frente a blanda (máxima verosimilitud) sobre
+    # el mismo flujo y las mismas muestras del canal AWGN
+    if seed is not None:
+        hamming.reseed(seed)
+    codes = hamming.encode_bytes(data)
+    blocks = hamming.unpack_codewords(codes) if hamming.packed else codes
+    sent = blocks[:, :hamming.k]
+    channel = AWGNChannel.for_code(hamming, ebn0_db)
+    samples = channel.soft_apply(blocks, hamming.rng)
+    bits = max(sent.size, 1)
+
+    results = {}
+    for label, decode in (("dura", hamming.decode_hard), ("blanda", hamming.decode_soft)):
+        start = time.perf_counter()
+        decoded = decode(samples)
+        seconds = time.perf_counter() - start
+        bit_errors = int((decoded != sent).sum())
+        results[label] = {
+            "bit_errors": bit_errors,
+            "ber": bit_errors / bits,
+            "block_errors": int((decoded != sent).any(axis=1).sum()),
+            "seconds": seconds,
+            "blocks_per_s": len(blocks) / seconds if seconds > 0 else float("inf"),
+        }
+    results["canal"] = {
+        "ebn0_db": ebn0_db,
+        "sigma": channel.sigma,
+        "channel_ber": channel.bit_error_prob(),
+        "uncoded_ber": uncoded_ber(ebn0_db),
+        "blocks": len(blocks),
+    }
+    return results
+
+
+# =============================================================================
+# FLUJOS DE CÓDIGOS EN DISCO (np.memmap)
+# =============================================================================
+# Cabecera: magic, versión, n, k, flags, número de códigos. Después, un uint8 por código.
+STREAM_MAGIC = b"HMNG"
+STREAM_VERSION = 1
+STREAM_HEADER = struct.Struct("<4sBBBBQ")
+STREAM_CHUNK = 1 << 20
+
+
+def create_stream(path, count, n=7, k=4, flags=0):
+    with open(path, "wb") as f:
+        f.write(STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, n, k, flags, count))
+        f.truncate(STREAM_HEADER.size + count)
+    if count == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r+", offset=STREAM_HEADER.size, shape=(count,))
+
+
+def read_stream_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(STREAM_HEADER.size)
+    if len(raw) < STREAM_HEADER.size:
+        raise ValueError(f"{path}: archivo demasiado corto para ser un flujo Hamming")
+    magic, version, n, k, flags, count = STREAM_HEADER.unpack(raw)
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        raise ValueError(f"{path}: no es un flujo Hamming (v{STREAM_VERSION})")
+    return {"n": n, "k": k, "flags": flags, "count": count}
+
+
+def open_stream(path, mode="r"):
+    header = read_stream_header(path)
+    if header["count"] == 0:
+        return np.zeros(0, dtype=np.uint8), header
+    codes = np.memmap(path, dtype=np.uint8, mode=mode, offset=STREAM_HEADER.size, shape=(header["count"],))
+    return codes, header
+
+
+def _open_source_bytes(source):
+    # Acepta una ruta (se mapea sin cargarla) o cualquier array de bytes
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source) == 0:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(source, dtype=np.uint8, mode="r")
+    return np.asarray(source, dtype=np.uint8).ravel()
+
+
+def _require_packed(hamming):
+    if not hamming.packed:
+        raise ValueError(f"{hamming.name}: los flujos en disco solo admiten Hamming (7,4) y (8,4)")
+
+
+def _check_stream_code(hamming, header, path):
+    if (header["n"], header["k"], header["flags"]) != (hamming.n, hamming.k, int(hamming.extended)):
+        raise ValueError(f"{path}: el flujo es ({header['n']},{header['k']}), no {hamming.name}")
+
+
+def encode_to_stream(hamming, source, path, chunk=STREAM_CHUNK):
+    _require_packed(hamming)
+    data = _open_source_bytes(source)
+    codes = create_stream(path, 2 * len(data), hamming.n, hamming.k, int(hamming.extended))
+    for start in range(0, len(data), chunk):
+        block = data[start:start + chunk]
+        codes[2 * start:2 * (start + len(block))] = hamming.encode_bytes_packed(block)
+    if isinstance(codes, np.memmap):
+        codes.flush()
+    return len(codes)
+
+
+def corrupt_stream(hamming, path, channel, chunk=STREAM_CHUNK):
+    # Aplica el ruido del canal sobre el propio archivo, por trozos
+    _require_packed(hamming)
+    codes, header = open_stream(path, mode="r+")
+    _check_stream_code(hamming, header, path)
+    for start in range(0, len(codes), chunk):
+        codes[start:start + chunk] = hamming.transmit_packed(codes[start:start + chunk], channel)[0]
+    if isinstance(codes, np.memmap):
+        codes.flush()
+
+
+def decode_stream(hamming, path, out_path, chunk=STREAM_CHUNK):
+    # Decodifica el flujo a un archivo de bytes; devuelve los errores detectados
+    _require_packed(hamming)
+    codes, header = open_stream(path)
+    _check_stream_code(hamming, header, path)
+    chunk -= chunk % 2
+    total_errors = 0
+    with open(out_path, "wb") as out:
+        for start in range(0, len(codes), chunk):
+            data, detected = hamming.decode_bytes_packed(codes[start:start + chunk])
+            out.write(data.tobytes())
+            total_errors += int(detected.sum())
+    return total_errors
+
+# =============================================================================
+# INSTRUMENTACIÓN POR ETAPAS (OPCIONAL)
+# =============================================================================
+# Las funciones de la tubería aceptan stats=None; con un PipelineStats miden el
+# tiempo de cada etapa y clasifican cada bloque decodificado. Sin él no hay coste.
+PIPELINE_STAGES = ("load", "bits", "encode", "channel", "decode", "reconstruct", "plot")
+STAGE_LABELS = {"load": "Carga", "bits": "Conversión a bits", "encode": "Codificación",
+                "channel": "Canal", "decode": "Decodificación", "reconstruct": "Reconstrucción",
+                "plot": "Gráfica"}
+DECODE_COUNTERS = ("blocks", "blocks_hit", "channel_bit_errors", "corrected",
+                   "miscorrected", "uncorrectable", "undetected", "residual_bit_errors")
+
+
+class PipelineStats:
+    def __init__(self, hamming):
+        self.code_name = hamming.name
+        self.times = dict.fromkeys(PIPELINE_STAGES, 0.0)
+        self.calls = dict.fromkeys(PIPELINE_STAGES, 0)
+        self.counters = dict.fromkeys(DECODE_COUNTERS, 0)
+        # Histograma de síndromes: posición i = síndrome i leído como entero
+        self.syndromes = np.zeros(2 ** hamming.H.shape[0], dtype=np.int64)
+        self.syndrome_bits = hamming.H.shape[0]
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def record_decode(self, hamming, received, flips):
+        # Compara lo que hizo el decodificador con los errores reales del canal,
+        # con la misma clasificación que el barrido (decode_outcomes)
+        idx = hamming.syndrome_indices(received)
+        pos = hamming.syndrome_pos[idx]
+        detected = idx != 0
+        residual = hamming.residual_data_errors(flips, pos)
+        if flips.ndim == 1:
+            hit = flips != 0
+            flipped = int(np.unpackbits(flips).sum())
+        else:
+            hit = flips.any(axis=1)
+            flipped = int(flips.sum())
+
+        c = self.counters
+        c["blocks"] += len(idx)
+        c["channel_bit_errors"] += flipped
+        for key, value in decode_outcomes(hit, detected, pos, residual).items():
+            c[key] += value
+        self.syndromes += np.bincount(idx, minlength=len(self.syndromes))
+
+    def to_dict(self):
+        total = sum(self.times.values())
+        return {
+            "code": self.code_name,
+            "stages": {name: {"seconds": self.times[name], "calls": self.calls[name],
+                              "share": self.times[name] / total if total else 0.0}
+                       for name in PIPELINE_STAGES},
+            "total_seconds": total,
+            "counters": dict(self.counters),
+            "syndrome_histogram": {format(i, f"0{self.syndrome_bits}b"): int(count)
+                                   for i, count in enumerate(self.syndromes) if count},
+        }
+
+    def save_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self):
+        # Texto de varias líneas para la ventana de estadísticas
+        data = self.to_dict()
+        lines = [self.code_name, "", f"{'Etapa':<20}{'Llamadas':>10}{'Tiempo (ms)':>14}{'%':>8}"]
+        for name, stage in data["stages"].items():
+            lines.append(f"{STAGE_LABELS[name]:<20}{stage['calls']:>10}"
+                         f"{1000 * stage['seconds']:>14.2f}{100 * stage['share']:>8.1f}")
+        lines.append(f"{'Total':<20}{'':>10}{1000 * data['total_seconds']:>14.2f}")
+
+        c = self.counters
+        lines += ["", f"Bloques: {c['blocks']} | Afectados por el canal: {c['blocks_hit']} | "
+                      f"Bits alterados: {c['channel_bit_errors']}",
+                  f"Corregidos bien: {c['corrected']} | Mal corregidos: {c['miscorrected']} | "
+                  f"Errores dobles (SECDED): {c['uncorrectable']} | No detectados: {c['undetected']}",
+                  f"Bits erróneos tras decodificar: {c['residual_bit_errors']}",
+                  "", "Histograma de síndromes:"]
+        for syndrome, count in data["syndrome_histogram"].items():
+            lines.append(f"  {syndrome}  {count:>12}")
+        return "\n".join(lines)
+
+
+def _stage(stats, name):
+    # Cronómetro de una etapa, o nada si no hay instrumentación
+    return stats.stage(name) if stats is not None else nullcontext()
+
+
+def _timed(iterable, stats, name):
+    # Cuenta como etapa `name` el tiempo de producir cada elemento de un generador
+    iterator = iter(iterable)
+    while True:
+        with _stage(stats, name):
+            item = next(iterator, None)
+        if item is None:
+            return
+        yield item
+
+
+# =============================================================================
+# IMAGEN A RESOLUCIÓN COMPLETA: TUBERÍA POR FRANJAS
+# =============================================================================
+# Las franjas de filas pasan por codificar -> canal -> decodificar como una cadena
+# de generadores; las salidas se escriben en PGM (P5) a medida que llegan.
+STRIP_HEIGHT = 64
+
+
+def _read_pgm_header(f):
+    # Devuelve (ancho, alto, offset de datos) de un PGM binario de 8 bits
+    tokens = []
+    while len(tokens) < 4:
+        line = f.readline()
+        if not line:
+            raise ValueError("Cabecera PGM incompleta")
+        tokens += line.split(b"#")[0].split()
+    if tokens[0] != b"P5" or int(tokens[3]) != 255:
+        raise ValueError("Solo se admiten PGM binarios (P5) de 8 bits")
+    return int(tokens[1]), int(tokens[2]), f.tell()
+
+
+def write_pgm_header(f, width, height):
+    f.write(b"P5\n%d %d\n255\n" % (width, height))
+
+
+def write_pnm_header(f, width, height, channels=1):
+    # Grises -> PGM (P5), RGB -> PPM (P6), RGBA -> PAM (P7)
+    if channels == 1:
+        write_pgm_header(f, width, height)
+    elif channels == 3:
+        f.write(b"P6\n%d %d\n255\n" % (width, height))
+    else:
+        f.write(b"P7\nWIDTH %d\nHEIGHT %d\nDEPTH 4\nMAXVAL 255\nTUPLTYPE RGB_ALPHA\nENDHDR\n" % (width, height))
+
+
+PNM_EXTENSIONS = {1: ".pgm", 3: ".ppm", 4: ".pam"}
+
+
+def image_mode(path, color=True):
+    # Modo de trabajo: "L" (grises), "RGB" o "RGBA" según las bandas de la imagen
+    if not color:
+        return "L"
+    with open(path, "rb") as f:
+        if f.read(2) == b"P5":
+            return "L"
+    from PIL import Image
+    with Image.open(path) as img:
+        bands = img.getbands()
+        transparent = "transparency" in img.info
+    if "A" in bands or transparent:
+        return "RGBA"
+    return "L" if len(bands) == 1 and bands[0] != "P" else "RGB"
+
+
+def planes_to_bytes(pixels):
+    # (alto, ancho[, canales]) -> bytes plano a plano (todo R, luego todo G, ...)
+    if pixels.ndim == 2:
+        return pixels.ravel()
+    return np.ascontiguousarray(np.moveaxis(pixels, -1, 0)).ravel()
+
+
+def bytes_to_planes(data, shape):
+    # Inverso de planes_to_bytes; devuelve una vista (alto, ancho[, canales])
+    if len(shape) == 2:
+        return data.reshape(shape)
+    height, width, channels = shape
+    return np.moveaxis(data.reshape(channels, height, width), 0, -1)
+
+
+def read_image_strips(path, strip_height=STRIP_HEIGHT, mode="L"):
+    # Genera (fila_inicial, franja uint8 de alto x ancho [x canales]) en el modo
+    # pedido. Los PGM se leen por np.memmap; el resto de formatos los decodifica PIL.
+    with open(path, "rb") as f:
+        is_pgm = f.read(2) == b"P5"
+    if is_pgm and mode == "L":
+        with open(path, "rb") as f:
+            width, height, offset = _read_pgm_header(f)
+        pixels = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(height, width))
+        for y in range(0, height, strip_height):
+            yield y, np.array(pixels[y:y + strip_height])
+        return
+
+    from PIL import Image
+    with Image.open(path) as img:
+        width, height = img.size
+        for y in range(0, height, strip_height):
+            strip = img.crop((0, y, width, min(y + strip_height, height))).convert(mode)
+            yield y, np.asarray(strip)
+
+
+def image_size(path):
+    with open(path, "rb") as f:
+        if f.read(2) == b"P5":
+            f.seek(0)
+            return _read_pgm_header(f)[:2]
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.size
+
+
+def encode_strips(hamming, strips, stats=None):
+    # Las imágenes en color se codifican plano a plano
+    for y, strip in strips:
+        if stats is None:
+            yield y, strip, hamming.encode_bytes(planes_to_bytes(strip))
+            continue
+        with stats.stage("bits"):
+            blocks = hamming.bytes_to_blocks(planes_to_bytes(strip))
+        with stats.stage("encode"):
+            codes = hamming.encode_data_blocks(blocks)
+        yield y, strip, codes
+
+
+def transmit_strips(hamming, channel, encoded, interleaver=None, stats=None):
+    for y, strip, codes in encoded:
+        with _stage(stats, "channel"):
+            noisy, flips = hamming.transmit_codes(codes, channel, interleaver)
+        yield y, strip, noisy, flips
+
+
+def decode_strips(hamming, received, stats=None):
+    for y, strip, noisy, flips in received:
+        with _stage(stats, "decode"):
+            corrected, detected = hamming.decode_bytes(noisy, strip.size)
+        with _stage(stats, "reconstruct"):
+            noisy_pixels = bytes_to_planes(hamming.received_data_bytes(noisy, strip.size), strip.shape)
+            corrected = bytes_to_planes(corrected, strip.shape)
+        if stats is not None:
+            stats.record_decode(hamming, noisy, flips)
+        yield y, strip, noisy_pixels, corrected, detected, flips
+
+
+def stream_image_simulation(hamming, path, channel, noisy_path, corrected_path,
+                            strip_height=STRIP_HEIGHT, preview_max=None, interleaver=None,
+                            progress=None, cancel=None, stats=None, color=False):
+    # Procesa la imagen completa por franjas. La memoria usada depende del alto de
+    # franja, no del tamaño de la imagen. Con preview_max se guarda además una
+    # versión reducida (lado mayor <= preview_max) de las tres imágenes.
+    # progress(filas_hechas, filas_totales, bloques) se llama tras cada franja; si
+    # el evento `cancel` se activa, se para al acabar la franja en curso. Con
+    # `stats` (PipelineStats) se mide cada etapa. Con color=True las imágenes RGB /
+    # RGBA se conservan (salida PPM / PAM); si no, se pasan a grises (PGM).
+    width, height = image_size(path)
+    mode = image_mode(path, color)
+    step = max(1, -(-max(width, height) // preview_max)) if preview_max else 0
+    previews = ([], [], [])
+    hashes = (hashlib.sha256(), hashlib.sha256())
+    result = {"width": width, "height": height, "mode": mode, "blocks": 0, "errors_detected": 0,
+              "flipped_bits": 0, "residual_pixel_errors": 0, "cancelled": False}
+
+    strips = read_image_strips(path, strip_height, mode)
+    if stats is not None:
+        strips = _timed(strips, stats, "load")
+    pipeline = decode_strips(hamming, transmit_strips(hamming, channel, encode_strips(hamming, strips, stats),
+                                                      interleaver, stats), stats)
+
+    with open(noisy_path, "wb") as f_noisy, open(corrected_path, "wb") as f_corr:
+        write_pnm_header(f_noisy, width, height, len(mode))
+        write_pnm_header(f_corr, width, height, len(mode))
+        for y, strip, noisy, corrected, detected, flips in pipeline:
+            with _stage(stats, "reconstruct"):
+                corrected_bytes = corrected.tobytes()
+                f_noisy.write(noisy.tobytes())
+                f_corr.write(corrected_bytes)
+            hashes[0].update(strip)
+            hashes[1].update(corrected_bytes)
+
+            wrong = corrected != strip
+            result["blocks"] += len(detected)
+            result["errors_detected"] += int(detected.sum())
+            result["flipped_bits"] += hamming.count_flips(flips)
+            result["residual_pixel_errors"] += int(np.count_nonzero(wrong.any(axis=2) if wrong.ndim == 3 else wrong))
+
+            if step:
+                first = (-y) % step
+                for preview, img in zip(previews, (strip, noisy, corrected)):
+                    preview.append(img[first::step, ::step])
+
+            if progress is not None:
+                progress(y + len(strip), height, result["blocks"])
+            if cancel is not None and cancel.is_set():
+                result["cancelled"] = True
+                pipeline.close()
+                break
+
+    if not result["cancelled"]:
+        result.update(recovery_result(hashes[0].hexdigest(), hashes[1].hexdigest()))
+        if step:
+            result["previews"] = tuple(np.concatenate(p) for p in previews)
+    return result
+
+
+def correction_map(original, noisy, corrected):
+    # 0 = píxel intacto, 1 = dañado y reparado, 2 = sigue erróneo tras decodificar
+    damaged = noisy != original
+    residual = corrected != original
+    if damaged.ndim == 3:
+        # En color, un píxel cuenta como dañado si lo está cualquiera de sus canales
+        damaged, residual = damaged.any(axis=2), residual.any(axis=2)
+    return np.where(residual, 2, np.where(damaged, 1, 0)).astype(np.uint8)
+
+
+# =============================================================================
+# ARCHIVOS ARBITRARIOS Y VERIFICACIÓN POR HASH
+# =============================================================================
+# Cualquier archivo se trata como un flujo de bytes; la recuperación es perfecta
+# solo si el SHA-256 de la salida corregida coincide con el del original.
+def recovery_result(original_hash, corrected_hash):
+    return {"sha256_original": original_hash, "sha256_corrected": corrected_hash,
+            "perfect": original_hash == corrected_hash}
+
+
+def recovery_check(original, corrected):
+    return recovery_result(hashlib.sha256(np.ascontiguousarray(original)).hexdigest(),
+                           hashlib.sha256(np.ascontiguousarray(corrected)).hexdigest())
+
+
+def simulate_file(hamming, path, channel, noisy_path, corrected_path, chunk=STREAM_CHUNK,
+                  interleaver=None, stats=None, progress=None, cancel=None):
+    # Codifica, transmite y decodifica el archivo por trozos de `chunk` bytes; las
+    # salidas tienen exactamente el mismo tamaño que la entrada. progress y cancel
+    # funcionan como en stream_image_simulation (por trozos en vez de por franjas).
+    size = os.path.getsize(path)
+    data = np.memmap(path, dtype=np.uint8, mode="r") if size else np.zeros(0, dtype=np.uint8)
+    hashes = (hashlib.sha256(), hashlib.sha256())
+    result = {"bytes": size, "blocks": 0, "errors_detected": 0, "flipped_bits": 0, "residual_byte_errors": 0,
+              "cancelled": False}
+
+    with open(noisy_path, "wb") as f_noisy, open(corrected_path, "wb") as f_corr:
+        for start in range(0, size, chunk):
+            with _stage(stats, "load"):
+                block = np.array(data[start:start + chunk])
+            with _stage(stats, "bits"):
+                blocks = hamming.bytes_to_blocks(block)
+            with _stage(stats, "encode"):
+                codes = hamming.encode_data_blocks(blocks)
+            with _stage(stats, "channel"):
+                noisy, flips = hamming.transmit_codes(codes, channel, interleaver)
+            with _stage(stats, "decode"):
+                corrected, detected = hamming.decode_bytes(noisy, len(block))
+            if stats is not None:
+                stats.record_decode(hamming, noisy, flips)
+            with _stage(stats, "reconstruct"):
+                f_noisy.write(hamming.received_data_bytes(noisy, len(block)).tobytes())
+                f_corr.write(corrected.tobytes())
+            hashes[0].update(block)
+            hashes[1].update(corrected)
+
+            result["blocks"] += len(detected)
+            result["errors_detected"] += int(detected.sum())
+            result["flipped_bits"] += hamming.count_flips(flips)
+            result["residual_byte_errors"] += int(np.count_nonzero(corrected != block))
+
+            if progress is not None:
+                progress(start + len(block), size, result["blocks"])
+            if cancel is not None and cancel.is_set():
+                result["cancelled"] = True
+                break
+
+    if not result["cancelled"]:
+        result.update(recovery_result(hashes[0].hexdigest(), hashes[1].hexdigest()))
+    return result
+
+
+# =============================================================================
+# CACHÉ LRU DE IMÁGENES CODIFICADAS
+# =============================================================================
+# Guarda los píxeles ya reducidos y su flujo codificado, para que cambiar solo
+# el ruido no vuelva a leer el archivo ni a codificar.
+PREVIEW_SIZE = (150, 150)
+CACHE_BUDGET = 256 * 2 ** 20
+
+
+class EncodedImageCache:
+    def __init__(self, max_bytes=CACHE_BUDGET):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # La usan el hilo de trabajo y el hilo de la interfaz
+        self._lock = threading.Lock()
+
+    def key(self, hamming, path, size, color=False):
+        # Si el archivo cambia en disco, cambia su mtime y la entrada vieja deja de usarse
+        return (os.path.abspath(path), os.path.getmtime(path), tuple(size), hamming.r, hamming.extended, color)
+
+    def get(self, hamming, path, size=PREVIEW_SIZE, stats=None, color=False):
+        # Devuelve (píxeles, códigos); ambos de solo lectura. Con `stats`, un fallo
+        # de caché cuenta en las etapas de carga, conversión y codificación. En
+        # color, los códigos siguen el orden plano a plano de planes_to_bytes.
+        key = self.key(hamming, path, size, color)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        with _stage(stats, "load"):
+            from PIL import Image
+            mode = image_mode(path, color)
+            with Image.open(path) as img:
+                pixels = np.array(img.convert(mode).resize(tuple(size)))
+        with _stage(stats, "bits"):
+            blocks = hamming.bytes_to_blocks(planes_to_bytes(pixels))
+        with _stage(stats, "encode"):
+            codes = hamming.encode_data_blocks(blocks)
+        pixels.setflags(write=False)
+        codes.setflags(write=False)
+
+        with self._lock:
+            if key in self._entries:
+                # Otro hilo la codificó a la vez: se devuelve la suya y no se cuenta dos veces
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = (pixels, codes)
+            self.used_bytes += pixels.nbytes + codes.nbytes
+            # Se expulsan las entradas menos usadas; la recién insertada siempre se queda
+            while self.used_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (old_pixels, old_codes) = self._entries.popitem(last=False)
+                self.used_bytes -= old_pixels.nbytes + old_codes.nbytes
+        return pixels, codes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
 
 # =============================================================================
 # CLASE DE ANIMACIÓN (VERSIÓN CORREGIDA Y RÁPIDA)
 # =============================================================================
 class AnimacionTablaHamming:
-    def __init__(self, parent, bits_recibidos, hamming_instance, error_pos_real):
+    # La tabla se dibuja en un solo tk.Canvas: rectángulos y textos se crean una
+    # vez y cada paso solo cambia sus propiedades. Los pasos de un bloque se
+    # precalculan del resultado de la decodificación por lotes (modelo de la
+    # tabla) y en cada fotograma se aplican varios.
+    VELOCIDADES = {"Lenta": (120, 1), "Normal": (60, 1), "Rápida": (30, 3), "Muy rápida": (16, 12)}
+    COLORES = ["#d4e6f1", "#d5f5e3", "#fcf3cf"]
+
+    def __init__(self, parent, model, index):
+        import_gui()
         self.top = tk.Toplevel(parent)
-        self.top.title("Proceso de Decodificación Hamming (7,4)")
-        self.top.geometry("750x450")
         self.top.configure(bg="white")
-        
-        # Aseguramos que siempre haya 7 bits (rellenando con ceros si falta alguno)
-        self.bits = bits_recibidos
-        while len(self.bits) < 7:
-            self.bits.insert(0, 0)
-            
-        self.H = hamming_instance.H
-        self.error_pos_real = error_pos_real
-        self.labels = []
+        self.top.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.model = None
+        self.index = 0
         self.pasos = []
         self.indice_paso = 0
-        
-        # --- GUI DE LA TABLA ---
-        frame_tabla = tk.Frame(self.top, bg="white", padx=20, pady=20)
-        frame_tabla.pack(expand=True, fill="both")
-        
-        headers = ["Etapa"] + [f"Bit {i}" for i in range(7)] + ["Resultado"]
-        for j, h in enumerate(headers):
-            tk.Label(frame_tabla, text=h, font=("Arial", 10, "bold"), 
-                     borderwidth=1, relief="solid", width=8, bg="#ecf0f1").grid(row=0, column=j, sticky="nsew", ipady=5)
+        self.reproduciendo = False
+        self.job = None
+        self.velocidad_var = tk.StringVar(value="Normal")
+        self.encadenar_var = tk.BooleanVar(value=False)
 
-        self.row_names = ["Dato Recibido", "Prueba H-Fila 1", "Prueba H-Fila 2", "Prueba H-Fila 3", "Dato Corregido"]
-        
-        for i, nombre in enumerate(self.row_names):
-            fila_labels = []
-            tk.Label(frame_tabla, text=nombre, font=("Arial", 9, "bold"), 
-                     borderwidth=1, relief="solid", width=15, anchor="w", bg="#ecf0f1").grid(row=i+1, column=0, sticky="nsew", padx=1)
-            
-            # Celdas bits
-            for j in range(7):
-                lbl = tk.Label(frame_tabla, text="", font=("Consolas", 12), borderwidth=1, relief="solid", bg="white")
-                lbl.grid(row=i+1, column=j+1, sticky="nsew")
-                fila_labels.append(lbl)
-            
-            # Celda resultado
-            lbl_res = tk.Label(frame_tabla, text="", font=("Arial", 9, "bold"), borderwidth=1, relief="solid", bg="white", width=10)
-            lbl_res.grid(row=i+1, column=8, sticky="nsew")
-            fila_labels.append(lbl_res)
-            
-            self.labels.append(fila_labels)
+        # --- CONTROLES ---
+        controles = tk.Frame(self.top, bg="white")
+        controles.pack(fill="x", padx=20, pady=(15, 0))
+        ttk.Button(controles, text="◀ Bloque", command=lambda: self.mover_bloque(-1)).pack(side="left")
+        self.btn_play = ttk.Button(controles, text="⏸ Pausa", command=self.alternar_reproduccion)
+        self.btn_play.pack(side="left", padx=5)
+        ttk.Button(controles, text="⏭ Paso", command=self.paso).pack(side="left")
+        ttk.Button(controles, text="⏩ Completar", command=self.completar).pack(side="left", padx=5)
+        ttk.Button(controles, text="🔁 Repetir", command=lambda: self.mostrar_bloque(self.model, self.index)).pack(side="left")
+        ttk.Button(controles, text="Bloque ▶", command=lambda: self.mover_bloque(1)).pack(side="left", padx=5)
+        ttk.Label(controles, text="Velocidad:").pack(side="left", padx=(15, 0))
+        ttk.Combobox(controles, textvariable=self.velocidad_var, values=list(self.VELOCIDADES),
+                     state="readonly", width=11).pack(side="left", padx=5)
+        ttk.Checkbutton(controles, text="Encadenar bloques", variable=self.encadenar_var).pack(side="left")
 
+        self.canvas = tk.Canvas(self.top, bg="white", highlightthickness=0)
+        scroll = ttk.Scrollbar(self.top, orient="horizontal", command=self.canvas.xview)
+        self.canvas.configure(xscrollcommand=scroll.set)
         self.lbl_status = tk.Label(self.top, text="Iniciando...", font=("Arial", 11), bg="white", fg="blue")
-        self.lbl_status.pack(pady=10)
+        self.lbl_status.pack(side="bottom", pady=10)
+        scroll.pack(side="bottom", fill="x", padx=20)
+        self.canvas.pack(expand=True, fill="both", padx=20, pady=10)
+
+        self.top.bind("<Left>", lambda e: self.mover_bloque(-1))
+        self.top.bind("<Right>", lambda e: self.mover_bloque(1))
+        self.top.bind("<space>", lambda e: self.alternar_reproduccion())
+
+        self.mostrar_bloque(model, index)
+
+    def construir_tabla(self, hamming):
+        # Se rehace solo si cambia el código (n o número de filas de H)
+        self.hamming = hamming
+        self.n = hamming.n
+        self.checks = hamming.H.shape[0]
+        self.H = hamming.H
+        self.canvas.delete("all")
+
+        cell_w = 60 if self.n <= 16 else 32
+        cell_h, name_w, res_w = 34, 130, 100
+        headers = ["Etapa"] + [f"Bit {i}" if self.n <= 16 else str(i) for i in range(self.n)] + ["Resultado"]
+        widths = [name_w] + [cell_w] * self.n + [res_w]
+        lefts = np.concatenate([[0], np.cumsum(widths)])
+        row_names = (["Dato Recibido"] + [f"Prueba H-Fila {i+1}" for i in range(self.checks)]
+                     + ["Dato Corregido"])
 
-        # Construir y ejecutar
-        self.construir_pasos()
-        # Tiempo inicial corto (200ms)
-        self.top.after(200, self.ejecutar_siguiente_paso)
+        def cell(row, col, text="", fill="white", font=("Consolas", 12), tags=("", "")):
+            x0, x1, y0 = lefts[col], lefts[col + 1], row * cell_h
+            rect = self.canvas.create_rectangle(x0, y0, x1, y0 + cell_h, fill=fill, outline="#7f8c8d", tags=tags[0])
+            item = self.canvas.create_text((x0 + x1) / 2, y0 + cell_h / 2, text=text, font=font, tags=tags[1])
+            return rect, item
+
+        for col, name in enumerate(headers):
+            cell(0, col, name, "#ecf0f1", ("Arial", 10, "bold"))
+        # rects[fila][col] y texts[fila][col]; la última columna es la del resultado.
+        # Las etiquetas "celda"/"texto" permiten limpiar toda la tabla con una llamada.
+        self.rects, self.texts = [], []
+        tags = ("celda", "texto")
+        for row, name in enumerate(row_names, start=1):
+            cell(row, 0, name, "#ecf0f1", ("Arial", 9, "bold"))
+            items = [cell(row, col, tags=tags) for col in range(1, self.n + 1)]
+            items.append(cell(row, self.n + 1, font=("Arial", 9, "bold"), tags=tags))
+            self.rects.append([r for r, _ in items])
+            self.texts.append([t for _, t in items])
+
+        width, height = int(lefts[-1]), (len(row_names) + 1) * cell_h
+        self.canvas.configure(scrollregion=(0, 0, width, height), height=height)
+        self.top.geometry(f"{min(1200, width + 60)}x{height + 170}")
 
     def construir_pasos(self):
-        # 1. Cargar bits (instantáneo visualmente)
-        for i, bit in enumerate(self.bits):
-            self.pasos.append(("set", 0, i, str(bit))) # Row 0 is Data
-        self.pasos.append(("text", "Analizando bits recibidos..."))
+        # Lista de pasos del bloque actual: ("item", id, opciones) o ("status", texto)
+        m, i = self.model, self.index
+        bits = m.received[i]
+        syndrome = m.syndromes[i]
+        pos = int(m.error_pos[i])
+        fila_final = self.checks + 1
+        pasos = [("status", f"Bloque {i + 1}: analizando bits recibidos...")]
+        pasos += [("item", self.texts[0][c], {"text": str(b)}) for c, b in enumerate(bits)]
 
-        syndrome = []
-        colores = ["#d4e6f1", "#d5f5e3", "#fcf3cf"]
-        
-        # 2. Comprobaciones de Paridad
-        for row_idx in range(3): 
-            h_row = self.H[row_idx]
-            parity_sum = 0
-            
-            self.pasos.append(("text", f"Verificando Fila {row_idx+1} de Matriz H..."))
-            
-            for bit_idx, h_val in enumerate(h_row):
-                if h_val == 1:
-                    val_bit = self.bits[bit_idx]
-                    parity_sum += val_bit
-                    # Acción: Marcar celda
-                    self.pasos.append(("set", row_idx+1, bit_idx, str(val_bit)))
-                    self.pasos.append(("bg", row_idx+1, bit_idx, colores[row_idx]))
-            
-            res = parity_sum % 2
-            syndrome.append(res)
-            
-            color_res = "green" if res == 0 else "red"
-            txt_res = "OK (0)" if res == 0 else "MAL (1)"
-            self.pasos.append(("set_res", row_idx+1, txt_res, color_res))
-
-        # 3. Corrección
-        if np.any(syndrome):
-            self.pasos.append(("text", f"¡Error detectado! Síndrome: {syndrome}"))
-            
-            # Buscar columna
-            col_encontrada = -1
-            syndrome_tuple = tuple(syndrome)
-            for i in range(7):
-                if tuple(self.H[:, i]) == syndrome_tuple:
-                    col_encontrada = i
-                    break
-            
-            if col_encontrada != -1:
-                # Marcar columna verticalmente
-                for r in range(1, 4):
-                     if self.H[r-1][col_encontrada] == 1:
-                        self.pasos.append(("bg", r, col_encontrada, "#e74c3c")) # Rojo
-                
-                self.pasos.append(("text", f"Error en Bit {col_encontrada}. Corrigiendo..."))
-                
-                bits_corregidos = list(self.bits).copy()
-                bits_corregidos[col_encontrada] = 1 - bits_corregidos[col_encontrada]
-                
-                for i, bit in enumerate(bits_corregidos):
-                    bg = "#5dade2" if i == col_encontrada else "white"
-                    self.pasos.append(("set", 4, i, str(bit)))
-                    self.pasos.append(("bg", 4, i, bg))
-                
-                self.pasos.append(("set_res", 4, "REPARADO", "blue"))
+        # Comprobaciones de paridad: solo las columnas con un 1 en cada fila de H
+        for row in range(self.checks):
+            pasos.append(("status", f"Verificando Fila {row+1} de Matriz H..."))
+            color = self.COLORES[row % len(self.COLORES)]
+            for c in np.flatnonzero(self.H[row]):
+                pasos.append(("item", self.texts[row + 1][c], {"text": str(bits[c])}))
+                pasos.append(("item", self.rects[row + 1][c], {"fill": color}))
+            ok = syndrome[row] == 0
+            pasos.append(("item", self.texts[row + 1][-1],
+                          {"text": "OK (0)" if ok else "MAL (1)", "fill": "green" if ok else "red"}))
+
+        if not m.detected[i]:
+            pasos.append(("status", "Transmisión Correcta. Sin errores."))
+            pasos += [("item", self.texts[fila_final][c], {"text": str(b)}) for c, b in enumerate(bits)]
+            pasos.append(("item", self.texts[fila_final][-1], {"text": "INTACTO", "fill": "green"}))
+        elif pos >= 0:
+            pasos.append(("status", f"¡Error detectado! Síndrome: {syndrome.tolist()}"))
+            for row in np.flatnonzero(self.H[:, pos]):
+                pasos.append(("item", self.rects[row + 1][pos], {"fill": "#e74c3c"}))
+            pasos.append(("status", f"Error en Bit {pos}. Corrigiendo..."))
+            corregidos = bits.copy()
+            corregidos[pos] ^= 1
+            for c, b in enumerate(corregidos):
+                pasos.append(("item", self.texts[fila_final][c], {"text": str(b)}))
+                pasos.append(("item", self.rects[fila_final][c], {"fill": "#5dade2" if c == pos else "white"}))
+            pasos.append(("item", self.texts[fila_final][-1], {"text": "REPARADO", "fill": "blue"}))
         else:
-            self.pasos.append(("text", "Transmisión Correcta. Sin errores."))
-            for i, bit in enumerate(self.bits):
-                self.pasos.append(("set", 4, i, str(bit)))
-            self.pasos.append(("set_res", 4, "INTACTO", "green"))
+            # Solo en SECDED: síndrome sin columna en H -> error doble
+            pasos.append(("status", "Error doble detectado: no se puede corregir."))
+            pasos.append(("item", self.texts[fila_final][-1], {"text": "DESCARTADO", "fill": "red"}))
+        return pasos
 
-    def ejecutar_siguiente_paso(self):
-        try:
-            if self.indice_paso >= len(self.pasos):
-                self.lbl_status.config(text="Proceso finalizado.", fg="black")
-                return
-
-            tipo = self.pasos[self.indice_paso][0]
-            data = self.pasos[self.indice_paso]
-            
-            # Mapeo de índices
-            # data[1] es fila (0..4) -> self.labels[0..4]
-            # data[2] es columna bit (0..6) -> self.labels[row][0..6]
-            
-            if tipo == "set":
-                self.labels[data[1]][data[2]].config(text=data[3])
-            elif tipo == "bg":
-                self.labels[data[1]][data[2]].config(bg=data[3])
-            elif tipo == "set_res":
-                # La celda de resultado es la última (-1)
-                self.labels[data[1]][-1].config(text=data[2], fg=data[3])
-            elif tipo == "text":
-                self.lbl_status.config(text=data[1])
-
-            self.indice_paso += 1
-            # VELOCIDAD: 60ms (Bastante rápido para que no aburra)
-            self.top.after(60, self.ejecutar_siguiente_paso)
-            
-        except Exception as e:
-            print(f"Error en animación: {e}")
+    def mostrar_bloque(self, model, index):
+        # Reutiliza la ventana: limpia las celdas y prepara los pasos del bloque
+        self.detener()
+        if model is not self.model or model.hamming.n != getattr(self, "n", None) \
+                or model.hamming.H.shape[0] != getattr(self, "checks", None):
+            self.construir_tabla(model.hamming)
+        self.model, self.index = model, index
+        self.top.title(f"Proceso de Decodificación {model.hamming.name} - Bloque {index + 1} de {len(model)}")
+        self.canvas.itemconfigure("celda", fill="white")
+        self.canvas.itemconfigure("texto", text="", fill="black")
+        self.pasos = self.construir_pasos()
+        self.indice_paso = 0
+        self.reproducir()
+
+    def mover_bloque(self, step):
+        index = self.index + step
+        if 0 <= index < len(self.model):
+            self.mostrar_bloque(self.model, index)
+
+    def aplicar_pasos(self, count):
+        end = min(len(self.pasos), self.indice_paso + count)
+        for paso in self.pasos[self.indice_paso:end]:
+            if paso[0] == "item":
+                self.canvas.itemconfigure(paso[1], **paso[2])
+            else:
+                self.lbl_status.config(text=paso[1], fg="blue")
+        self.indice_paso = end
+        if self.indice_paso >= len(self.pasos):
+            self.lbl_status.config(text=f"Bloque {self.index + 1}: proceso finalizado.", fg="black")
+
+    def ejecutar_fotograma(self):
+        self.job = None
+        if not self.reproduciendo:
+            return
+        frame_ms, por_fotograma = self.VELOCIDADES[self.velocidad_var.get()]
+        self.aplicar_pasos(por_fotograma)
+        if self.indice_paso < len(self.pasos):
+            self.job = self.top.after(frame_ms, self.ejecutar_fotograma)
+        elif self.encadenar_var.get() and self.index + 1 < len(self.model):
+            self.job = self.top.after(4 * frame_ms, lambda: self.mover_bloque(1))
+        else:
+            self.detener()
+
+    def reproducir(self):
+        self.reproduciendo = True
+        self.btn_play.config(text="⏸ Pausa")
+        if self.job is None:
+            self.job = self.top.after(60, self.ejecutar_fotograma)
+
+    def detener(self):
+        self.reproduciendo = False
+        self.btn_play.config(text="▶ Reproducir")
+        if self.job is not None:
+            self.top.after_cancel(self.job)
+            self.job = None
+
+    def alternar_reproduccion(self):
+        if self.reproduciendo:
+            self.detener()
+        elif self.indice_paso < len(self.pasos):
+            self.reproducir()
+        else:
+            self.mover_bloque(1)
+
+    def paso(self):
+        self.detener()
+        self.aplicar_pasos(1)
+
+    def completar(self):
+        self.detener()
+        self.aplicar_pasos(len(self.pasos))
+
+    def cerrar(self):
+        self.detener()
+        self.top.destroy()
+
+
+# =============================================================================
+# MODELO DE LA TABLA DE BLOQUES (PESTAÑA DATOS)
+# =============================================================================
+class BlockTableModel:
+    # Resultados por bloque guardados en arrays; el texto de cada fila se genera
+    # solo cuando la fila se muestra en pantalla
+    def __init__(self, hamming, data_blocks, encoded, received, detected, error_pos, syndromes):
+        self.hamming = hamming
+        self.data_blocks = data_blocks
+        self.encoded = encoded
+        self.received = received
+        self.detected = detected
+        self.error_pos = error_pos
+        self.syndromes = syndromes
+
+        self.errors_detected = int(detected.sum())
+        self.errors_corrected = int((detected & (error_pos >= 0)).sum())
+        self.uncorrectable = self.errors_detected - self.errors_corrected
+
+    @classmethod
+    def simulate(cls, hamming, bits, channel, stats=None):
+        # bits: array de 0/1 con longitud múltiplo de k; todo en una pasada
+        data_blocks = np.asarray(bits, dtype=np.uint8).reshape(-1, hamming.k)
+        with _stage(stats, "encode"):
+            encoded = hamming.encode_blocks(data_blocks)
+        with _stage(stats, "channel"):
+            received, flips = hamming.transmit(encoded, channel)
+        with _stage(stats, "decode"):
+            _, detected, syndromes, error_pos = hamming.decode_blocks(received)
+        if stats is not None:
+            stats.record_decode(hamming, received, flips)
+        return cls(hamming, data_blocks, encoded, received, detected, error_pos, syndromes)
+
+    def __len__(self):
+        return len(self.data_blocks)
+
+    @staticmethod
+    def _bits_str(bits):
+        return (bits + ord('0')).astype(np.uint8).tobytes().decode()
+
+    def row(self, i):
+        # (valores de la fila, etiqueta de estilo)
+        if not self.detected[i]:
+            status, tag = "✅ INTEGRO", "ok"
+        elif self.error_pos[i] < 0:
+            status, tag = "⛔ ERROR DOBLE (NO CORREGIBLE)", "error"
+        else:
+            status, tag = "⚠️ ERROR DETECTADO", "error"
+        values = (self._bits_str(self.data_blocks[i]), self._bits_str(self.encoded[i]),
+                  self._bits_str(self.received[i]), status)
+        return values, tag
+
+    def summary(self):
+        return (f"{self.hamming.name} | Bloques: {len(self)} | Errores detectados: {self.errors_detected} | "
+                f"Corregidos: {self.errors_corrected} | No corregibles: {self.uncorrectable}")
 
 
 # =============================================================================
@@ -227,11 +1470,40 @@ class AnimacionTablaHamming:
 # =============================================================================
 class HammingApp:
     def __init__(self, root):
+        import_gui()
         self.root = root
         self.root.title("Proyecto Final - Corrección Hamming (7,4)")
-        self.root.geometry("950x700") 
+        self.root.geometry("1050x950") 
         self.hamming = HammingChannel()
         self.selected_image_path = None
+        self.channel_var = tk.StringVar(value=next(iter(CHANNEL_MODELS)))
+        self.seed_var = tk.StringVar()
+        self.code_var = tk.StringVar(value=next(iter(HAMMING_CODES)))
+        self.extended_var = tk.BooleanVar(value=False)
+        self.full_res_var = tk.BooleanVar(value=False)
+        self.strip_var = tk.IntVar(value=STRIP_HEIGHT)
+        self.preview_var = tk.BooleanVar(value=True)
+        self.color_var = tk.BooleanVar(value=False)
+        self.interleave_var = tk.IntVar(value=0)
+        self.ebn0_var = tk.DoubleVar(value=5.0)
+
+        # Simulación de imagen en segundo plano (un solo trabajo a la vez)
+        self.worker = None
+        self.job_queue = None
+        self.cancel_event = None
+        self.worker_start = 0.0
+        self.worker_finish = None
+
+        # Imágenes reducidas ya codificadas + vista en vivo al mover el ruido
+        self.image_cache = EncodedImageCache()
+        self.live_var = tk.BooleanVar(value=False)
+        self.live_pending = None
+        self.heatmap_var = tk.BooleanVar(value=False)
+        self.last_results = None
+
+        # Instrumentación por etapas (opcional, compartida por las dos pestañas)
+        self.stats_var = tk.BooleanVar(value=False)
+        self.last_stats = None
 
         style = ttk.Style()
         style.theme_use('clam')
@@ -285,14 +1557,76 @@ class HammingApp:
         self.noise_slider.pack(side="left", padx=10)
         self.lbl_noise_val = ttk.Label(noise_frame, text="15%")
         self.lbl_noise_val.pack(side="left")
-        self.noise_slider.configure(command=lambda v: self.lbl_noise_val.configure(text=f"{int(float(v))}%"))
+        self.noise_slider.configure(command=self.on_noise_change)
+
+        code_frame = ttk.Frame(frame)
+        code_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Label(code_frame, text="Código Hamming:").pack(side="left")
+        ttk.Combobox(code_frame, textvariable=self.code_var, values=list(HAMMING_CODES),
+                     state="readonly", width=10).pack(side="left", padx=10)
+        ttk.Checkbutton(code_frame, text="Extendido (SECDED)", variable=self.extended_var).pack(side="left")
+
+        channel_frame = ttk.Frame(frame)
+        channel_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Label(channel_frame, text="Modelo de canal:").pack(side="left")
+        ttk.Combobox(channel_frame, textvariable=self.channel_var, values=list(CHANNEL_MODELS),
+                     state="readonly", width=25).pack(side="left", padx=10)
+        ttk.Label(channel_frame, text="Semilla (opcional):").pack(side="left")
+        ttk.Entry(channel_frame, textvariable=self.seed_var, width=10).pack(side="left", padx=10)
+
+        stream_frame = ttk.Frame(frame)
+        stream_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Checkbutton(stream_frame, text="Resolución completa (por franjas)",
+                        variable=self.full_res_var).pack(side="left")
+        ttk.Label(stream_frame, text="Alto de franja:").pack(side="left", padx=(15, 0))
+        ttk.Spinbox(stream_frame, from_=1, to=4096, textvariable=self.strip_var, width=6).pack(side="left", padx=5)
+        ttk.Checkbutton(stream_frame, text="Mostrar vista previa",
+                        variable=self.preview_var).pack(side="left", padx=15)
+        ttk.Checkbutton(stream_frame, text="Color (RGB/RGBA por planos)",
+                        variable=self.color_var).pack(side="left")
+
+        interleave_frame = ttk.Frame(frame)
+        interleave_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Label(interleave_frame, text="Entrelazado (profundidad, 0 = sin entrelazar):").pack(side="left")
+        ttk.Spinbox(interleave_frame, from_=0, to=1024, textvariable=self.interleave_var, width=6).pack(side="left", padx=5)
+        self.btn_compare = ttk.Button(interleave_frame, text="📊 Comparar con/sin entrelazado",
+                                      command=self.run_interleaving_report)
+        self.btn_compare.pack(side="left", padx=15)
+        ttk.Checkbutton(interleave_frame, text="Vista en vivo (re-simula al mover el ruido)",
+                        variable=self.live_var).pack(side="left")
+
+        awgn_frame = ttk.Frame(frame)
+        awgn_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Label(awgn_frame, text="Canal AWGN (BPSK), Eb/N0 en dB:").pack(side="left")
+        ttk.Spinbox(awgn_frame, from_=-2, to=12, increment=0.5, textvariable=self.ebn0_var,
+                    width=6).pack(side="left", padx=5)
+        self.btn_soft = ttk.Button(awgn_frame, text="📡 Comparar decodificación dura/blanda",
+                                   command=self.run_decoding_report)
+        self.btn_soft.pack(side="left", padx=15)
 
         ttk.Separator(frame, orient='horizontal').pack(fill='x', pady=15)
 
-        btn_run = ttk.Button(frame, text="🚀 EJECUTAR SIMULACIÓN VISUAL", command=self.run_image_simulation)
-        btn_run.pack(fill="x", pady=5)
+        run_frame = ttk.Frame(frame)
+        run_frame.pack(fill="x", pady=5)
+        self.btn_run = ttk.Button(run_frame, text="🚀 EJECUTAR SIMULACIÓN VISUAL", command=self.run_image_simulation)
+        self.btn_run.pack(side="left", fill="x", expand=True)
+        self.btn_cancel = ttk.Button(run_frame, text="✖ Cancelar", command=self.cancel_simulation, state="disabled")
+        self.btn_cancel.pack(side="left", padx=(10, 0))
+
+        progress_frame = ttk.Frame(frame)
+        progress_frame.pack(fill="x", pady=5)
+        self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", maximum=100)
+        self.progress_bar.pack(side="left", fill="x", expand=True)
+        self.lbl_rate = ttk.Label(progress_frame, text="", width=18, anchor="e")
+        self.lbl_rate.pack(side="left", padx=(10, 0))
+
         self.lbl_status = ttk.Label(frame, text="Listo.", foreground="gray")
         self.lbl_status.pack()
+        self.build_stats_controls(frame)
+
+        ttk.Checkbutton(frame, text="Mostrar mapa de correcciones", variable=self.heatmap_var,
+                        command=self.build_canvas_axes).pack(anchor="w")
+        self.setup_results_canvas(frame)
 
     def select_file(self):
         filename = filedialog.askopenfilename(title="Seleccionar Imagen", filetypes=[("Imágenes", "*.jpg *.jpeg *.png *.bmp")])
@@ -300,61 +1634,400 @@ class HammingApp:
             self.selected_image_path = filename
             self.lbl_path.config(text=f"Archivo: ...{filename[-30:]}", foreground="green")
 
+    def apply_code_selection(self):
+        # Cambia de código solo si la selección cambió; se conserva el generador
+        r, extended = HAMMING_CODES[self.code_var.get()], self.extended_var.get()
+        if (self.hamming.r, self.hamming.extended) != (r, extended):
+            rng = self.hamming.rng
+            self.hamming = HammingChannel(r, extended)
+            self.hamming.rng = rng
+        return self.hamming
+
+    def build_channel(self, noise_prob):
+        # Con semilla, cada ejecución repite exactamente el mismo ruido
+        seed = self.seed_var.get().strip()
+        if seed:
+            self.hamming.reseed(int(seed))
+        return make_channel(self.channel_var.get(), noise_prob)
+
+    def build_interleaver(self):
+        depth = self.interleave_var.get()
+        return BlockInterleaver(depth) if depth > 0 else None
+
+    def job_hamming(self):
+        # Códec con generador propio para el hilo de trabajo: los Generator de numpy
+        # no son seguros entre hilos y la pestaña de texto sigue usando self.hamming.
+        # Su semilla sale de self.hamming, así que con semilla fija se repite igual.
+        hamming = self.apply_code_selection()
+        return HammingChannel(hamming.r, hamming.extended, seed=int(hamming.rng.integers(2 ** 63)))
+
+    def build_job(self):
+        # Los widgets solo se leen aquí, en el hilo principal
+        self.apply_code_selection()
+        channel = self.build_channel(self.noise_slider.get() / 100.0)
+        hamming = self.job_hamming()
+        return {
+            "path": self.selected_image_path,
+            "hamming": hamming,
+            "channel": channel,
+            "interleaver": self.build_interleaver(),
+            "full_res": self.full_res_var.get(),
+            "strip_height": max(1, self.strip_var.get()),
+            "preview": self.preview_var.get(),
+            "color": self.color_var.get(),
+            "stats": PipelineStats(hamming) if self.stats_var.get() else None,
+        }
+
     def run_image_simulation(self):
+        # No se admite una segunda ejecución mientras hay una en curso
+        if self.worker is not None:
+            return
         if not self.selected_image_path:
             messagebox.showwarning("Atención", "Selecciona una imagen primero.")
             return
-        noise_prob = self.noise_slider.get() / 100.0
+
+        try:
+            job = self.build_job()
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"Parámetros no válidos: {e}")
+            return
+        self.start_worker(self.image_worker, job, self.finish_image_simulation)
+
+    def start_worker(self, target, job, finish):
+        # Un solo trabajo a la vez (imagen o archivo): mismo hilo, cola y cancelación
+        self.job_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = threading.Thread(target=target, args=(job,), daemon=True)
+        self.worker_finish = finish
+        self.worker_start = time.perf_counter()
+        self.set_running(True)
         self.lbl_status.config(text="Procesando...", foreground="blue")
-        self.root.update()
+        self.worker.start()
+        self.root.after(50, self.poll_worker)
 
+    def set_running(self, running):
+        self.btn_run.config(state="disabled" if running else "normal")
+        self.btn_compare.config(state="disabled" if running else "normal")
+        self.btn_soft.config(state="disabled" if running else "normal")
+        self.btn_file.config(state="disabled" if running else "normal")
+        self.btn_cancel.config(state="normal" if running else "disabled")
+        self.btn_file_cancel.config(state="normal" if running else "disabled")
+        self.progress_bar["value"] = 0
+        self.lbl_rate.config(text="")
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.lbl_status.config(text="Cancelando...", foreground="orange")
+
+    # --- Hilo de trabajo: no toca ningún widget, solo escribe en la cola ---
+    def image_worker(self, job):
         try:
-            img = Image.open(self.selected_image_path).convert('L')
-            img = img.resize((150, 150)) 
-            img_arr = np.array(img)
-            original_shape = img_arr.shape
-            flattened_pixels = img_arr.flatten()
-
-            encoded_stream = []
-            noisy_stream = []
-            corrected_stream = []
-            total_errors = 0
-
-            for pixel in flattened_pixels:
-                bits = self.hamming.text_to_bits(pixel, 8)
-                n_high, n_low = bits[:4], bits[4:]
-                
-                parts_reconstructed = []
-                for nibble in [n_high, n_low]:
-                    encoded = self.hamming.encode_block(nibble)
-                    noisy = self.hamming.simulate_noise(encoded, noise_prob)
-                    decoded_nibble, error_found, _, _ = self.hamming.decode_block(noisy)
-                    noisy_stream.append(noisy) 
-                    if error_found: total_errors += 1
-                    parts_reconstructed.extend(decoded_nibble)
-                corrected_pixel = self.hamming.bits_to_text(parts_reconstructed)
-                corrected_stream.append(corrected_pixel)
-
-            noisy_pixels = []
-            for i in range(0, len(noisy_stream), 2):
-                n1 = noisy_stream[i][:4]
-                n2 = noisy_stream[i+1][:4]
-                val = self.hamming.bits_to_text(np.concatenate((n1, n2)))
-                noisy_pixels.append(val)
-            
-            img_noisy = np.array(noisy_pixels).reshape(original_shape)
-            img_corrected = np.array(corrected_stream).reshape(original_shape)
-            self.lbl_status.config(text=f"Errores corregidos: {total_errors}", foreground="green")
-
-            plt.figure(figsize=(12, 5))
-            plt.suptitle(f"Análisis: {total_errors} errores corregidos exitosamente", fontsize=14)
-            plt.subplot(1, 3, 1); plt.title("Original"); plt.imshow(img_arr, cmap='gray'); plt.axis('off')
-            plt.subplot(1, 3, 2); plt.title("Señal con Ruido"); plt.imshow(img_noisy, cmap='gray'); plt.axis('off')
-            plt.subplot(1, 3, 3); plt.title("Restaurada (Hamming)"); plt.imshow(img_corrected, cmap='gray'); plt.axis('off')
-            plt.tight_layout()
-            plt.show()
+            if job["full_res"]:
+                result = self.simulate_full_res(job)
+            else:
+                result = self.simulate_reduced(job, progress=lambda done, total, blocks:
+                                               self.job_queue.put(("progress", done / total, blocks)),
+                                               cancel=self.cancel_event)
+            self.job_queue.put(("done", result))
+        except Exception as e:
+            self.job_queue.put(("error", str(e)))
+
+    def simulate_reduced(self, job, progress=None, cancel=None):
+        # Píxeles y códigos salen de la caché: solo se repiten canal y decodificación
+        hamming, stats = job["hamming"], job["stats"]
+        img_arr, encoded_stream = self.image_cache.get(hamming, job["path"], stats=stats, color=job["color"])
+        original_shape = img_arr.shape
+
+        # El flujo va por trozos de STREAM_CHUNK códigos para poder informar del
+        # progreso y cancelar. Cada trozo es múltiplo de 8 (bytes enteros tras
+        # decodificar) y de la profundidad del entrelazado (mismas tramas).
+        nbytes = img_arr.size
+        total = len(encoded_stream)
+        depth = job["interleaver"].depth if job["interleaver"] is not None else 1
+        step = max(STREAM_CHUNK - STREAM_CHUNK % (8 * depth), 8 * depth)
+        parts, done_bytes = [], 0
+        for start in range(0, total, step):
+            if cancel is not None and cancel.is_set():
+                return {"blocks": start, "cancelled": True, "stats": stats}
+            codes = encoded_stream[start:start + step]
+            with _stage(stats, "channel"):
+                noisy, flips = hamming.transmit_codes(codes, job["channel"], job["interleaver"])
+            with _stage(stats, "decode"):
+                part_bytes = min(len(codes) * hamming.k // 8, nbytes - done_bytes)
+                corrected, found = hamming.decode_bytes(noisy, part_bytes)
+            done_bytes += part_bytes
+            parts.append((noisy, flips, corrected, found))
+            if progress is not None:
+                progress(start + len(codes), total, start + len(codes))
+
+        noisy_stream, flips, corrected_stream, error_found = (np.concatenate(p) for p in zip(*parts))
+        if stats is not None:
+            stats.record_decode(hamming, noisy_stream, flips)
+
+        # La imagen "con ruido" usa los bits de datos sin corregir
+        with _stage(stats, "reconstruct"):
+            noisy_pixels = hamming.received_data_bytes(noisy_stream, nbytes)
+            img_noisy = bytes_to_planes(noisy_pixels, original_shape)
+            img_corrected = bytes_to_planes(corrected_stream, original_shape)
+        return {
+            "blocks": len(error_found),
+            "errors_detected": int(error_found.sum()),
+            "flipped_bits": hamming.count_flips(flips),
+            "previews": (img_arr, img_noisy, img_corrected),
+            "cancelled": False,
+            "stats": stats,
+            **recovery_check(img_arr, img_corrected),
+        }
+
+    def simulate_full_res(self, job):
+        # Imagen a tamaño real; las salidas se guardan junto al archivo original
+        base, _ = os.path.splitext(job["path"])
+        ext = PNM_EXTENSIONS[len(image_mode(job["path"], job["color"]))]
+        noisy_path, corrected_path = base + "_ruido" + ext, base + "_corregida" + ext
+        stats = stream_image_simulation(job["hamming"], job["path"], job["channel"],
+                                        noisy_path, corrected_path,
+                                        strip_height=job["strip_height"],
+                                        preview_max=600 if job["preview"] else None,
+                                        interleaver=job["interleaver"],
+                                        progress=lambda done, total, blocks:
+                                            self.job_queue.put(("progress", done / total, blocks)),
+                                        cancel=self.cancel_event, stats=job["stats"], color=job["color"])
+        if stats["cancelled"]:
+            # Sin salidas a medias
+            for path in (noisy_path, corrected_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        stats["output"] = corrected_path
+        stats["stats"] = job["stats"]
+        return stats
+
+    # --- Hilo principal: consulta la cola con root.after ---
+    def poll_worker(self):
+        try:
+            while True:
+                message = self.job_queue.get_nowait()
+                if message[0] == "progress":
+                    _, fraction, blocks = message
+                    elapsed = max(time.perf_counter() - self.worker_start, 1e-9)
+                    self.progress_bar["value"] = 100 * fraction
+                    self.lbl_rate.config(text=f"{blocks / elapsed / 1e6:.2f} M bloques/s")
+                elif message[0] == "done":
+                    self.worker = None
+                    self.worker_finish(message[1])
+                    return
+                else:
+                    self.worker = None
+                    self.set_running(False)
+                    self.lbl_status.config(text="Error.", foreground="red")
+                    messagebox.showerror("Error", message[1])
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self.poll_worker)
+
+    def finish_image_simulation(self, result):
+        elapsed = time.perf_counter() - self.worker_start
+        self.set_running(False)
+        if result["cancelled"]:
+            self.lbl_status.config(text="Simulación cancelada.", foreground="gray")
+            return
+
+        self.progress_bar["value"] = 100
+        self.lbl_rate.config(text=f"{result['blocks'] / max(elapsed, 1e-9) / 1e6:.2f} M bloques/s")
+        total_errors = result["errors_detected"]
+        text = f"Errores corregidos: {total_errors} | Bits alterados por el canal: {result['flipped_bits']}"
+        if "output" in result:
+            text = f"{result['width']}x{result['height']} | {text} | Salida: {os.path.basename(result['output'])}"
+        self.lbl_status.config(text=f"{text} | {self.recovery_text(result)}", foreground="green")
+        if "previews" in result:
+            self.show_figure(*result["previews"], total_errors, stats=result["stats"])
+        self.set_last_stats(result["stats"])
+
+    @staticmethod
+    def recovery_text(result):
+        return "Recuperación perfecta (SHA-256 idéntico) ✔" if result["perfect"] else "Recuperación con errores ✘"
+
+    def run_interleaving_report(self):
+        # Misma imagen y misma realización del canal, con y sin entrelazado
+        if not self.selected_image_path:
+            messagebox.showwarning("Atención", "Selecciona una imagen primero.")
+            return
+        depth = self.interleave_var.get()
+        if depth < 1:
+            messagebox.showwarning("Atención", "Elige una profundidad de entrelazado mayor que 0.")
+            return
+        try:
+            hamming = self.apply_code_selection()
+            noise_prob = self.noise_slider.get() / 100.0
+            model = self.channel_var.get()
+            seed = self.seed_var.get().strip()
+            pixels = self.image_cache.get(hamming, self.selected_image_path, color=self.color_var.get())[0]
+            results = compare_interleaving(hamming, pixels,
+                                           lambda: make_channel(model, noise_prob), depth,
+                                           int(seed) if seed else None)
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+
+        rows = [("Bits alterados", "channel_bit_errors"), ("Bloques afectados", "blocks_hit"),
+                ("Bloques corregidos", "corrected"), ("Mal corregidos", "miscorrected"),
+                ("Errores dobles (SECDED)", "uncorrectable"), ("No detectados", "undetected"),
+                ("Bits erróneos finales", "residual_bit_errors")]
+        labels = list(results)
+        lines = [f"{hamming.name} | {model} | ruido {noise_prob:.0%}", "",
+                 f"{'':<24}" + "".join(f"{l:>20}" for l in labels)]
+        for name, key in rows:
+            lines.append(f"{name:<24}" + "".join(f"{results[l][key]:>20}" for l in labels))
+        lines.append(f"{'BER residual':<24}" + "".join(f"{results[l]['residual_ber']:>20.2e}" for l in labels))
+        messagebox.showinfo("Informe de entrelazado", "\n".join(lines))
+
+    def run_decoding_report(self):
+        # Misma imagen y mismas muestras AWGN para los decodificadores duro y blando
+        if not self.selected_image_path:
+            messagebox.showwarning("Atención", "Selecciona una imagen primero.")
+            return
+        try:
+            hamming = self.apply_code_selection()
+            if not hamming.soft_decodable:
+                raise ValueError(f"{hamming.name}: la decodificación blanda solo está disponible "
+                                 f"hasta (15,11)")
+            ebn0 = self.ebn0_var.get()
+            seed = self.seed_var.get().strip()
+            pixels = self.image_cache.get(hamming, self.selected_image_path, color=self.color_var.get())[0]
+            results = compare_decoders(hamming, pixels, ebn0, int(seed) if seed else None)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        channel = results["canal"]
+        labels = ("dura", "blanda")
+        lines = [f"{hamming.name} | AWGN (BPSK) | Eb/N0 {ebn0:g} dB | {channel['blocks']} bloques",
+                 f"BER del canal (decisión dura): {channel['channel_ber']:.2e} | "
+                 f"BPSK sin codificar: {channel['uncoded_ber']:.2e}", "",
+                 f"{'':<22}" + "".join(f"{l:>16}" for l in labels)]
+        lines.append(f"{'Bits erróneos':<22}" + "".join(f"{results[l]['bit_errors']:>16}" for l in labels))
+        lines.append(f"{'Bloques erróneos':<22}" + "".join(f"{results[l]['block_errors']:>16}" for l in labels))
+        lines.append(f"{'BER':<22}" + "".join(f"{results[l]['ber']:>16.2e}" for l in labels))
+        lines.append(f"{'Tiempo (ms)':<22}" + "".join(f"{1000 * results[l]['seconds']:>16.1f}" for l in labels))
+        lines.append(f"{'Bloques/s':<22}" + "".join(f"{results[l]['blocks_per_s']:>16,.0f}" for l in labels))
+        messagebox.showinfo("Decodificación dura frente a blanda", "\n".join(lines))
+
+    def on_noise_change(self, value):
+        self.lbl_noise_val.configure(text=f"{int(float(value))}%")
+        if not self.live_var.get() or self.full_res_var.get() or not self.selected_image_path:
+            return
+        # Agrupa los eventos del deslizador: solo se simula el último valor
+        if self.live_pending is not None:
+            self.root.after_cancel(self.live_pending)
+        self.live_pending = self.root.after(20, self.live_update)
+
+    def live_update(self):
+        # Re-ruido y re-decodificación sobre el flujo en caché, en el hilo principal
+        self.live_pending = None
+        if self.worker is not None:
+            return
+        start = time.perf_counter()
+        try:
+            result = self.simulate_reduced(self.build_job())
+        except Exception as e:
+            self.lbl_status.config(text=f"Vista en vivo: {e}", foreground="red")
+            return
+        elapsed_ms = 1000 * (time.perf_counter() - start)
+        self.lbl_status.config(text=f"Errores corregidos: {result['errors_detected']} | "
+                                    f"Bits alterados por el canal: {result['flipped_bits']} | "
+                                    f"{self.recovery_text(result)} | {elapsed_ms:.0f} ms", foreground="green")
+        self.show_figure(*result["previews"], result["errors_detected"], stats=result["stats"])
+        self.set_last_stats(result["stats"])
+
+    # --- Figura embebida: se crea una vez y después solo se cambian los datos ---
+    def setup_results_canvas(self, parent):
+        self.figure = Figure(figsize=(10, 3.2), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, pady=(5, 0))
+        self.build_canvas_axes()
+
+    def build_canvas_axes(self):
+        # Solo se rehace la figura al activar/desactivar el mapa de correcciones
+        self.figure.clear()
+        panels = ["Original", "Señal con Ruido", "Restaurada (Hamming)"]
+        if self.heatmap_var.get():
+            panels.append("Mapa de correcciones")
+        axes = self.figure.subplots(1, len(panels))
+
+        placeholder = np.zeros(PREVIEW_SIZE, dtype=np.uint8)
+        self.canvas_images = []
+        for ax, name in zip(axes, panels):
+            ax.set_title(name, fontsize=10)
+            ax.axis('off')
+            if name == "Mapa de correcciones":
+                cmap = ListedColormap(["black", "#2ecc71", "#e74c3c"])
+                self.canvas_images.append(ax.imshow(placeholder, cmap=cmap, vmin=0, vmax=2))
+            else:
+                self.canvas_images.append(ax.imshow(placeholder, cmap='gray', vmin=0, vmax=255))
+        self.figure_title = self.figure.suptitle("Sin resultados todavía", fontsize=12)
+        self.figure.tight_layout()
+
+        if self.last_results is not None:
+            self.show_figure(*self.last_results)
+        else:
+            self.canvas.draw_idle()
+
+    def show_figure(self, img_arr, img_noisy, img_corrected, total_errors, stats=None):
+        with _stage(stats, "plot"):
+            self.update_figure(img_arr, img_noisy, img_corrected, total_errors)
+            if stats is None:
+                self.canvas.draw_idle()
+            else:
+                # Dibujo inmediato para que la etapa mida el render real
+                self.canvas.draw()
+
+    def update_figure(self, img_arr, img_noisy, img_corrected, total_errors):
+        self.last_results = (img_arr, img_noisy, img_corrected, total_errors)
+        data = [img_arr, img_noisy, img_corrected]
+        if len(self.canvas_images) == 4:
+            data.append(correction_map(img_arr, img_noisy, img_corrected))
+
+        for image, values in zip(self.canvas_images, data):
+            if image.get_array().shape != values.shape:
+                # Cambio de tamaño (vista reducida <-> vista previa a resolución completa)
+                height, width = values.shape[:2]
+                image.set_extent((-0.5, width - 0.5, height - 0.5, -0.5))
+                image.axes.set_xlim(-0.5, width - 0.5)
+                image.axes.set_ylim(height - 0.5, -0.5)
+            image.set_data(values)
+        self.figure_title.set_text(f"Análisis: {total_errors} errores corregidos exitosamente")
+
+    # --- Estadísticas por etapa (instrumentación opcional) ---
+    def build_stats_controls(self, parent):
+        stats_frame = ttk.Frame(parent)
+        stats_frame.pack(anchor="w", fill="x", pady=(5, 0))
+        ttk.Checkbutton(stats_frame, text="Instrumentación (tiempos por etapa y diagnóstico del decodificador)",
+                        variable=self.stats_var).pack(side="left")
+        ttk.Button(stats_frame, text="📈 Ver estadísticas", command=self.show_stats_window).pack(side="left", padx=15)
+
+    def set_last_stats(self, stats):
+        if stats is not None:
+            self.last_stats = stats
+
+    def show_stats_window(self):
+        if self.last_stats is None:
+            messagebox.showinfo("Estadísticas", "Activa la instrumentación y ejecuta una simulación.")
+            return
+        stats = self.last_stats
+        top = tk.Toplevel(self.root)
+        top.title("Estadísticas de la simulación")
+        text = tk.Text(top, width=90, height=30, font=("Consolas", 10))
+        text.insert("1.0", stats.report())
+        text.config(state="disabled")
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        ttk.Button(top, text="💾 Exportar JSON", command=lambda: self.export_stats(stats)).pack(pady=(0, 10))
+
+    def export_stats(self, stats):
+        path = filedialog.asksaveasfilename(title="Exportar estadísticas", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            stats.save_json(path)
 
     # -------------------------------------------------------------------------
     # PESTAÑA 2: TEXTO (CON BOTÓN DE ANIMACIÓN ESTILO TABLA)
@@ -373,6 +2046,11 @@ class HammingApp:
         
         btn_proc_bits = ttk.Button(input_frame, text="Procesar", command=self.run_text_simulation)
         btn_proc_bits.pack(side="left", padx=10)
+        self.btn_file = ttk.Button(input_frame, text="📄 Archivo...", command=self.run_file_simulation)
+        self.btn_file.pack(side="left")
+        self.btn_file_cancel = ttk.Button(input_frame, text="✖", width=3, command=self.cancel_simulation,
+                                          state="disabled")
+        self.btn_file_cancel.pack(side="left", padx=(5, 0))
 
         noise_frame = ttk.Frame(input_frame)
         noise_frame.pack(side="left", padx=20)
@@ -380,11 +2058,29 @@ class HammingApp:
         self.txt_noise_slider = ttk.Scale(noise_frame, from_=0, to=100, orient='horizontal', length=100)
         self.txt_noise_slider.set(50) 
         self.txt_noise_slider.pack(side="left", padx=5)
+        ttk.Combobox(noise_frame, textvariable=self.channel_var, values=list(CHANNEL_MODELS),
+                     state="readonly", width=22).pack(side="left", padx=5)
+        ttk.Combobox(noise_frame, textvariable=self.code_var, values=list(HAMMING_CODES),
+                     state="readonly", width=8).pack(side="left", padx=5)
+        ttk.Checkbutton(noise_frame, text="SECDED", variable=self.extended_var).pack(side="left")
 
         ttk.Label(frame, text="Selecciona una fila para ver el proceso:", style="Header.TLabel").pack(anchor="w")
+        self.lbl_table_summary = ttk.Label(frame, text="Sin datos.", foreground="gray")
+        self.lbl_table_summary.pack(anchor="w", pady=(0, 5))
+        self.build_stats_controls(frame)
+
+        # --- TABLA VIRTUAL: solo existen los ítems de las filas visibles ---
+        self.table_model = None
+        self.table_offset = 0
+        self.table_visible = 10
+        self.table_selected = None
+        self.animacion = None
+
+        table_frame = ttk.Frame(frame)
+        table_frame.pack(side="top", fill="both", expand=True, pady=5)
 
         columns = ("bloque", "codificado", "ruidoso", "estado")
-        self.tree = ttk.Treeview(frame, columns=columns, show='headings', height=10)
+        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=10, selectmode="browse")
         
         self.tree.heading("bloque", text="Bloque (4b)")
         self.tree.heading("codificado", text="Enviado (7b)")
@@ -396,10 +2092,22 @@ class HammingApp:
         self.tree.column("ruidoso", anchor="center")
         self.tree.column("estado", anchor="center")
 
-        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        self.tree.pack(side="top", fill="both", expand=True, pady=5)
-        scrollbar.pack(side="right", fill="y")
+        self.tree.tag_configure("ok", foreground="green")
+        self.tree.tag_configure("error", foreground="red", background="#fadbd8")
+
+        self.table_scroll = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_table_scroll)
+        self.table_scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self.on_table_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_table_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_table(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_table(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_table(1, "units"))
+        self.tree.bind("<Up>", lambda e: self.move_table_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_table_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.move_table_selection(-self.table_visible))
+        self.tree.bind("<Next>", lambda e: self.move_table_selection(self.table_visible))
 
         # --- BOTÓN PARA ABRIR LA ANIMACIÓN DE TABLA ---
         btn_animar = tk.Button(frame, text="🎥 VER DETALLE TABLA HAMMING", 
@@ -408,68 +2116,339 @@ class HammingApp:
         btn_animar.pack(fill="x", pady=10)
 
     def run_text_simulation(self):
-        for i in self.tree.get_children(): self.tree.delete(i)
-        cadena = self.entry_bits.get()
+        cadena = self.entry_bits.get().strip()
         noise_prob = self.txt_noise_slider.get() / 100.0
+        hamming = self.apply_code_selection()
+        stats = PipelineStats(hamming) if self.stats_var.get() else None
 
-        if not cadena or not all(c in '01' for c in cadena):
+        # Validación vectorizada (la cadena puede tener cientos de miles de bits)
+        with _stage(stats, "bits"):
+            try:
+                bits = np.frombuffer(cadena.encode("ascii"), dtype=np.uint8) - ord('0')
+            except UnicodeEncodeError:
+                bits = None
+            if bits is not None:
+                bits = np.pad(bits, (0, -len(bits) % hamming.k))
+        if not cadena or bits is None or (bits > 1).any():
             messagebox.showerror("Error", "Solo 0s y 1s.")
             return
-        while len(cadena) % 4 != 0: cadena += "0"
-
-        for i in range(0, len(cadena), 4):
-            chunk_str = cadena[i:i+4]
-            nibble = [int(b) for b in chunk_str]
-            encoded = self.hamming.encode_block(nibble)
-            noisy = self.hamming.simulate_noise(encoded, noise_prob)
-            decoded, error_found, _, error_pos = self.hamming.decode_block(noisy)
-            
-            enc_str = ''.join(map(str, encoded))
-            noisy_str = ''.join(map(str, noisy))
-            
-            tag_name = f"error_{error_pos}" if error_found else "ok"
-            display_status = "⚠️ ERROR DETECTADO" if error_found else "✅ INTEGRO"
-            
-            self.tree.insert("", "end", values=(chunk_str, enc_str, noisy_str, display_status), tags=(tag_name,))
 
-        self.tree.tag_configure("ok", foreground="green")
-        for i in range(7):
-            self.tree.tag_configure(f"error_{i}", foreground="red", background="#fadbd8")
+        try:
+            channel = self.build_channel(noise_prob)
+        except ValueError:
+            messagebox.showerror("Error", "La semilla debe ser un número entero.")
+            return
 
-    def abrir_animacion_tabla(self):
+        self.tree.heading("bloque", text=f"Bloque ({hamming.k}b)")
+        self.tree.heading("codificado", text=f"Enviado ({hamming.n}b)")
+        self.tree.heading("ruidoso", text=f"Recibido ({hamming.n}b)")
+
+        self.table_model = BlockTableModel.simulate(hamming, bits, channel, stats)
+        self.table_offset = 0
+        self.table_selected = None
+        with _stage(stats, "plot"):
+            self.lbl_table_summary.config(text=self.table_model.summary(), foreground="black")
+            self.render_table()
+        self.set_last_stats(stats)
+
+    def run_file_simulation(self):
+        # Cualquier archivo como flujo de bytes; salidas junto al original, byte a byte.
+        # Va por el mismo hilo de trabajo que las imágenes (progreso y cancelación).
+        if self.worker is not None:
+            return
+        path = filedialog.askopenfilename(title="Seleccionar archivo")
+        if not path:
+            return
+        try:
+            self.apply_code_selection()
+            channel = self.build_channel(self.txt_noise_slider.get() / 100.0)
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"Parámetros no válidos: {e}")
+            return
+        hamming = self.job_hamming()
+        base, ext = os.path.splitext(path)
+        job = {
+            "path": path,
+            "hamming": hamming,
+            "channel": channel,
+            "noisy_path": base + "_ruido" + ext,
+            "corrected_path": base + "_corregido" + ext,
+            "stats": PipelineStats(hamming) if self.stats_var.get() else None,
+        }
+        self.lbl_table_summary.config(text=f"Procesando {os.path.basename(path)}...", foreground="blue")
+        self.start_worker(self.file_worker, job, self.finish_file_simulation)
+
+    # --- Hilo de trabajo ---
+    def file_worker(self, job):
+        try:
+            result = simulate_file(job["hamming"], job["path"], job["channel"],
+                                   job["noisy_path"], job["corrected_path"], stats=job["stats"],
+                                   progress=lambda done, total, blocks:
+                                       self.job_queue.put(("progress", done / total, blocks)),
+                                   cancel=self.cancel_event)
+            if result["cancelled"]:
+                for path in (job["noisy_path"], job["corrected_path"]):
+                    if os.path.exists(path):
+                        os.remove(path)
+            result.update(job)
+            self.job_queue.put(("done", result))
+        except Exception as e:
+            self.job_queue.put(("error", str(e)))
+
+    def finish_file_simulation(self, result):
+        self.set_running(False)
+        self.lbl_status.config(text="Listo.", foreground="gray")
+        if result["cancelled"]:
+            self.lbl_table_summary.config(text="Archivo: simulación cancelada.", foreground="gray")
+            return
+        self.set_last_stats(result["stats"])
+
+        text = (f"{result['hamming'].name} | {os.path.basename(result['path'])}: {result['bytes']} bytes | "
+                f"Errores corregidos: {result['errors_detected']} | Bytes erróneos: {result['residual_byte_errors']} | "
+                f"{self.recovery_text(result)}")
+        self.lbl_table_summary.config(text=text, foreground="green" if result["perfect"] else "red")
+        messagebox.showinfo("Archivo procesado",
+                            f"{text}\n\nSHA-256 original:  {result['sha256_original']}\n"
+                            f"SHA-256 corregido: {result['sha256_corrected']}\n\n"
+                            f"Salida: {os.path.basename(result['corrected_path'])}")
+
+    def render_table(self):
+        # Solo se crean los ítems de la ventana visible; el iid es el índice del bloque
+        self.tree.delete(*self.tree.get_children())
+        model = self.table_model
+        if model is None or len(model) == 0:
+            self.table_scroll.set(0, 1)
+            return
+        end = min(len(model), self.table_offset + self.table_visible)
+        for i in range(self.table_offset, end):
+            values, tag = model.row(i)
+            self.tree.insert("", "end", iid=str(i), values=values, tags=(tag,))
+        if self.table_selected is not None and self.table_offset <= self.table_selected < end:
+            self.tree.selection_set(str(self.table_selected))
+        self.table_scroll.set(self.table_offset / len(model), end / len(model))
+
+    def scroll_table(self, amount, what="units"):
+        if self.table_model is None:
+            return "break"
+        step = amount * (self.table_visible if what == "pages" else 1)
+        self.set_table_offset(self.table_offset + step)
+        return "break"
+
+    def set_table_offset(self, offset):
+        limit = max(0, len(self.table_model) - self.table_visible)
+        offset = min(max(0, int(offset)), limit)
+        if offset != self.table_offset:
+            self.table_offset = offset
+            self.render_table()
+
+    def on_table_scroll(self, action, value, what=None):
+        # Recibe los comandos de la barra de desplazamiento ("moveto" / "scroll")
+        if self.table_model is None:
+            return
+        if action == "moveto":
+            self.set_table_offset(float(value) * len(self.table_model))
+        else:
+            self.scroll_table(int(value), what)
+
+    def on_table_resize(self, event):
+        # Filas que caben en pantalla (altura de fila 25 px, más la cabecera)
+        visible = max(1, (event.height - 25) // 25)
+        if visible != self.table_visible:
+            self.table_visible = visible
+            if self.table_model is not None:
+                limit = max(0, len(self.table_model) - visible)
+                self.table_offset = min(self.table_offset, limit)
+                self.render_table()
+
+    def on_table_select(self, event):
         seleccion = self.tree.selection()
-        if not seleccion:
+        if seleccion:
+            self.table_selected = int(seleccion[0])
+
+    def move_table_selection(self, step):
+        if self.table_model is None or len(self.table_model) == 0:
+            return "break"
+        current = self.table_selected if self.table_selected is not None else self.table_offset
+        self.table_selected = min(max(0, current + step), len(self.table_model) - 1)
+        if self.table_selected < self.table_offset:
+            self.set_table_offset(self.table_selected)
+        elif self.table_selected >= self.table_offset + self.table_visible:
+            self.set_table_offset(self.table_selected - self.table_visible + 1)
+        self.render_table()
+        return "break"
+
+    def abrir_animacion_tabla(self):
+        if self.table_model is None or self.table_selected is None:
             messagebox.showwarning("Atención", "Primero selecciona una fila de la tabla.")
             return
 
-        item = self.tree.item(seleccion[0])
-        values = item['values']
-        tags = item['tags']
-
-        # --- CORRECCIÓN CLAVE ---
-        # 1. Convertimos a string
-        val_str = str(values[2])
-        # 2. Rellenamos con ceros a la izquierda si faltan (ej: "101" -> "0000101")
-        val_str = val_str.zfill(7)
-        # 3. Convertimos a lista de enteros
-        cadena_recibida = [int(x) for x in val_str]
-        
-        tag_info = tags[0] if tags else "ok"
-        error_pos_real = -1
-        
-        if "error" in str(tag_info):
-             try:
-                error_pos_real = int(str(tag_info).split("_")[1])
-             except:
-                pass
+        # Los datos salen del modelo, no del texto de la tabla. Si la ventana ya
+        # está abierta se reutiliza con el bloque elegido.
+        if self.animacion is not None and self.animacion.top.winfo_exists():
+            self.animacion.mostrar_bloque(self.table_model, self.table_selected)
+            self.animacion.top.lift()
+        else:
+            self.animacion = AnimacionTablaHamming(self.root, self.table_model, self.table_selected)
+
+
+# =============================================================================
+# MODO CONSOLA: PROCESAMIENTO POR LOTES SIN INTERFAZ
+# =============================================================================
+# Cada imagen se procesa a resolución completa (tubería por franjas) en su propio
+# proceso, con un flujo aleatorio independiente derivado de la semilla común.
+# Los archivos que no son imágenes se procesan como flujos de bytes.
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".pgm")
+OUTPUT_SUFFIXES = ("_ruido", "_corregida", "_corregido")
+
+
+def collect_images(inputs):
+    # Archivos sueltos (de cualquier tipo) y las imágenes (no recursivo) de los
+    # directorios; se ignoran las salidas de ejecuciones anteriores
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in IMAGE_EXTENSIONS and not stem.endswith(OUTPUT_SUFFIXES):
+                    paths.append(os.path.join(item, name))
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            raise FileNotFoundError(f"No existe: {item}")
+    return paths
+
+
+def output_paths(path, out_dir=None, ext=".pgm", corrected="_corregida"):
+    base, _ = os.path.splitext(path)
+    if out_dir is not None:
+        base = os.path.join(out_dir, os.path.basename(base))
+    return base + "_ruido" + ext, base + corrected + ext
 
-        AnimacionTablaHamming(self.root, cadena_recibida, self.hamming, error_pos_real)
+
+def process_image(task):
+    # Una imagen (o archivo) completo; devuelve su entrada del informe (o el error)
+    path, out_dir, r, extended, model, noise_prob, depth, strip_height, seed, with_stats, color = task
+    ext = os.path.splitext(path)[1]
+    is_image = ext.lower() in IMAGE_EXTENSIONS
+    start = time.perf_counter()
+    try:
+        hamming = HammingChannel(r, extended, seed=seed)
+        stats = PipelineStats(hamming) if with_stats else None
+        channel = make_channel(model, noise_prob)
+        interleaver = BlockInterleaver(depth) if depth > 0 else None
+        if is_image:
+            noisy_path, corrected_path = output_paths(path, out_dir, PNM_EXTENSIONS[len(image_mode(path, color))])
+            result = stream_image_simulation(hamming, path, channel, noisy_path, corrected_path, strip_height,
+                                             interleaver=interleaver, stats=stats, color=color)
+            del result["cancelled"]
+        else:
+            noisy_path, corrected_path = output_paths(path, out_dir, ext, "_corregido")
+            result = simulate_file(hamming, path, channel, noisy_path, corrected_path,
+                                   interleaver=interleaver, stats=stats)
+    except Exception as e:
+        return {"input": path, "error": str(e)}
+    result.update(input=path, kind="image" if is_image else "file", noisy=noisy_path,
+                  corrected=corrected_path, seconds=time.perf_counter() - start)
+    if stats is not None:
+        result["stats"] = stats.to_dict()
+    return result
+
+
+def run_batch(paths, noise_prob, model="bsc", r=3, extended=False, seed=None, depth=0,
+              strip_height=STRIP_HEIGHT, out_dir=None, workers=None, with_stats=False, color=False):
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(len(paths))
+    tasks = [(path, out_dir, r, extended, model, noise_prob, depth, strip_height, s, with_stats, color)
+             for path, s in zip(paths, seeds)]
+
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tasks)))
+    if workers == 1:
+        results = [process_image(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(process_image, tasks))
+    return {
+        "code": HammingChannel(r, extended).name,
+        "model": model,
+        "noise_prob": noise_prob,
+        "seed": seed,
+        "interleave_depth": depth,
+        "workers": workers,
+        "elapsed": time.perf_counter() - start,
+        "images": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simulación Hamming de imágenes. Sin entradas abre la interfaz gráfica.")
+    parser.add_argument("inputs", nargs="*", help="imágenes, archivos o directorios a procesar (modo consola)")
+    parser.add_argument("--noise", type=float, default=0.15, help="probabilidad de ruido (0-1)")
+    parser.add_argument("--model", choices=list(CHANNEL_KEYS), default="single")
+    parser.add_argument("--r", type=int, default=3, help="bits de paridad: código (2^r-1, 2^r-r-1)")
+    parser.add_argument("--extended", action="store_true", help="añadir paridad global (SECDED)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--interleave", type=int, default=0, help="profundidad de entrelazado (0 = sin)")
+    parser.add_argument("--strip-height", type=int, default=STRIP_HEIGHT)
+    parser.add_argument("--out", default=None, help="directorio de salida (por defecto, junto a cada imagen)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", default=None, help="archivo JSON con el informe")
+    parser.add_argument("--stats", action="store_true", help="incluir la instrumentación por etapas")
+    parser.add_argument("--color", action="store_true", help="conservar RGB/RGBA (codificación por planos)")
+    args = parser.parse_args(argv)
+
+    # Mismos límites que HammingChannel y BlockInterleaver, comprobados antes de lanzar nada
+    if not 2 <= args.r <= 10:
+        parser.error("--r debe estar entre 2 y 10")
+    if not 0.0 <= args.noise <= 1.0:
+        parser.error("--noise debe estar entre 0 y 1")
+    if args.interleave < 0:
+        parser.error("--interleave debe ser >= 0")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers debe ser >= 1")
+
+    if not args.inputs:
+        import_gui()
+        root = tk.Tk()
+        HammingApp(root)
+        root.mainloop()
+        return 0
+
+    try:
+        paths = collect_images(args.inputs)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not paths:
+        parser.error("no se encontraron imágenes")
+
+    report = run_batch(paths, args.noise, args.model, args.r, args.extended, args.seed, args.interleave,
+                       max(1, args.strip_height), args.out, args.workers, args.stats, args.color)
+    print(f"{report['code']} | {args.model} | ruido {args.noise:.2%} | {len(paths)} entradas "
+          f"| {report['elapsed']:.2f} s")
+    failed = 0
+    for item in report["images"]:
+        if "error" in item:
+            failed += 1
+            print(f"  ERROR {item['input']}: {item['error']}")
+        else:
+            if item["kind"] == "image":
+                size, residual = f"{item['width']}x{item['height']} {item['mode']}", \
+                    f"píxeles erróneos {item['residual_pixel_errors']}"
+            else:
+                size, residual = f"{item['bytes']} bytes", f"bytes erróneos {item['residual_byte_errors']}"
+            print(f"  {item['input']}: {size} | corregidos {item['errors_detected']} "
+                  f"| bits alterados {item['flipped_bits']} | {residual} "
+                  f"| {'perfecta' if item['perfect'] else 'con errores'} | {item['seconds']:.2f} s")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failed else 0
 
 
 # =============================================================================
 # 3. LANZAMIENTO
 # =============================================================================
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = HammingApp(root)
-    root.mainloop()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,439 @@
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import time
+
+import numpy as np
+
+from proyecto import HammingChannel, CHANNEL_KEYS, make_channel, write_pgm_header
+
+# =============================================================================
+# TRANSMISIÓN REAL POR LA RED LOCAL (asyncio, UDP / TCP)
+# =============================================================================
+# emisor -> [relé con pérdidas y ruido] -> receptor, todo sobre 127.0.0.1.
+# Cada paquete lleva una cabecera y los códigos Hamming de un trozo de los datos:
+# un uint8 por código si r = 3, o los bits de los códigos empaquetados si no.
+#
+# Cabecera: tipo, secuencia, bytes de datos, bytes de carga, instante de envío.
+# El paquete de fin lleva en la carga un JSON con el total y el formato.
+FRAME_HEADER = struct.Struct("!BIHHd")
+FRAME_DATA = 0
+FRAME_END = 1
+PACKET_BYTES = 512
+BATCH_PACKETS = 32
+FRAME_MAX_PAYLOAD = 0xFFFF  # el campo de longitud de la carga es un uint16
+UDP_MAX_PAYLOAD = 65507 - FRAME_HEADER.size
+SOCKET_BUFFER = 8 * 2 ** 20
+IDLE_TIMEOUT = 5.0
+FLOW_WAIT = 0.1
+
+
+# -----------------------------------------------------------------------------
+# 1. CARGA ÚTIL: BYTES <-> CÓDIGOS DE UN PAQUETE
+# -----------------------------------------------------------------------------
+def payload_size(hamming, nbytes):
+    if hamming.packed:
+        return 2 * nbytes
+    blocks = -(-8 * nbytes // hamming.k)
+    return -(-blocks * hamming.n // 8)
+
+
+def encode_packets(hamming, chunks):
+    # chunks: matriz P x B (P paquetes de B bytes) -> matriz P x carga, en una pasada
+    count, nbytes = chunks.shape
+    if hamming.packed:
+        return hamming.encode_bytes_packed(chunks).reshape(count, -1)
+    bits = np.unpackbits(chunks, axis=1)
+    bits = np.pad(bits, ((0, 0), (0, -bits.shape[1] % hamming.k)))
+    codes = hamming.encode_blocks(bits.reshape(-1, hamming.k))
+    return np.packbits(codes.reshape(count, -1), axis=1)
+
+
+def _payload_blocks(hamming, payload, nbytes):
+    blocks = -(-8 * nbytes // hamming.k)
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    return bits[:blocks * hamming.n].reshape(blocks, hamming.n)
+
+
+def decode_payload(hamming, payload, nbytes):
+    # Devuelve (bytes corregidos, error detectado por bloque)
+    if hamming.packed:
+        return hamming.decode_bytes_packed(np.frombuffer(payload, dtype=np.uint8))
+    return hamming.decode_bytes(_payload_blocks(hamming, payload, nbytes), nbytes)
+
+
+def corrupt_payload(hamming, payload, nbytes, channel):
+    # Pasa los códigos de un paquete por el canal; devuelve (carga, bits alterados)
+    if hamming.packed:
+        noisy, flips = hamming.transmit_packed(np.frombuffer(payload, dtype=np.uint8), channel)
+        return noisy.tobytes(), hamming.count_flips(flips)
+    noisy, flips = hamming.transmit(_payload_blocks(hamming, payload, nbytes), channel)
+    return np.packbits(noisy.ravel()).tobytes(), int(flips.sum())
+
+
+def pack_frame(kind, seq, nbytes, payload):
+    return FRAME_HEADER.pack(kind, seq, nbytes, len(payload), time.perf_counter()) + payload
+
+
+def parse_frame(frame):
+    kind, seq, nbytes, length, sent = FRAME_HEADER.unpack_from(frame)
+    return kind, seq, nbytes, frame[FRAME_HEADER.size:FRAME_HEADER.size + length], sent
+
+
+def iter_batches(hamming, data, packet_bytes, batch):
+    # Genera listas de paquetes ya enmarcados; se codifica un lote entero de golpe
+    full = len(data) // packet_bytes
+    for first in range(0, full, batch):
+        count = min(batch, full - first)
+        chunks = data[first * packet_bytes:(first + count) * packet_bytes].reshape(count, packet_bytes)
+        payloads = encode_packets(hamming, chunks)
+        yield [pack_frame(FRAME_DATA, first + i, packet_bytes, payloads[i].tobytes()) for i in range(count)]
+    rest = data[full * packet_bytes:]
+    if len(rest):
+        payload = encode_packets(hamming, rest.reshape(1, -1))[0]
+        yield [pack_frame(FRAME_DATA, full, len(rest), payload.tobytes())]
+
+
+def end_frame(data, packet_bytes, meta):
+    info = dict(meta, total_bytes=len(data), packet_bytes=packet_bytes,
+                packets=-(-len(data) // packet_bytes))
+    return pack_frame(FRAME_END, info["packets"], 0, json.dumps(info).encode())
+
+
+# -----------------------------------------------------------------------------
+# 2. RECEPTOR: DECODIFICA CADA PAQUETE AL LLEGAR Y REENSAMBLA
+# -----------------------------------------------------------------------------
+class Reassembler:
+    def __init__(self, hamming):
+        self.hamming = hamming
+        self.chunks = {}
+        self.meta = None
+        self.done = asyncio.get_running_loop().create_future()
+        self.wire_bytes = 0
+        self.errors_detected = 0
+        self.decode_latency = []
+        self.transit_latency = []
+        self.first_arrival = None
+        self.last_arrival = None
+
+    def feed(self, frame):
+        arrival = time.perf_counter()
+        kind, seq, nbytes, payload, sent = parse_frame(frame)
+        if kind == FRAME_END:
+            self.meta = json.loads(payload)
+            if not self.done.done():
+                self.done.set_result(True)
+            return
+        if self.first_arrival is None:
+            self.first_arrival = arrival
+        self.last_arrival = arrival
+        self.wire_bytes += len(frame)
+        self.transit_latency.append(arrival - sent)
+
+        start = time.perf_counter()
+        data, detected = decode_payload(self.hamming, payload, nbytes)
+        self.decode_latency.append(time.perf_counter() - start)
+        self.errors_detected += int(detected.sum())
+        self.chunks[seq] = data.tobytes()
+
+    def assemble(self):
+        # Los paquetes perdidos se rellenan con ceros
+        packet_bytes, total = self.meta["packet_bytes"], self.meta["total_bytes"]
+        out = bytearray(total)
+        for seq, chunk in self.chunks.items():
+            out[seq * packet_bytes:seq * packet_bytes + len(chunk)] = chunk
+        missing = sorted(set(range(self.meta["packets"])) - set(self.chunks))
+        return bytes(out), missing
+
+
+class UdpEndpoint(asyncio.DatagramProtocol):
+    # Receptor o relé UDP: cada datagrama es un paquete completo
+    def __init__(self, handler):
+        self.handler = handler
+        self.received = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        self.handler(data)
+
+
+async def read_frames(reader):
+    # Paquetes de un flujo TCP: cabecera de tamaño fijo + carga
+    while True:
+        try:
+            header = await reader.readexactly(FRAME_HEADER.size)
+        except asyncio.IncompleteReadError:
+            return
+        length = FRAME_HEADER.unpack(header)[3]
+        yield header + await reader.readexactly(length)
+
+
+# -----------------------------------------------------------------------------
+# 3. RELÉ CON PÉRDIDAS Y RUIDO
+# -----------------------------------------------------------------------------
+class Relay:
+    def __init__(self, hamming, channel=None, loss=0.0):
+        self.hamming = hamming
+        self.channel = channel
+        self.loss = loss
+        self.dropped = 0
+        self.flipped_bits = 0
+
+    def process(self, frame):
+        # Devuelve el paquete a reenviar, o None si se pierde (el de fin nunca se pierde)
+        kind, seq, nbytes, payload, sent = parse_frame(frame)
+        if kind == FRAME_END:
+            return frame
+        if self.loss and self.hamming.rng.random() < self.loss:
+            self.dropped += 1
+            return None
+        if self.channel is None:
+            return frame
+        payload, flips = corrupt_payload(self.hamming, payload, nbytes, self.channel)
+        self.flipped_bits += flips
+        return FRAME_HEADER.pack(kind, seq, nbytes, len(payload), sent) + payload
+
+
+# -----------------------------------------------------------------------------
+# 4. BANCO DE PRUEBAS EN BUCLE LOCAL
+# -----------------------------------------------------------------------------
+async def _wait_done(receiver):
+    # Fin al llegar el paquete de fin; error si pasan IDLE_TIMEOUT segundos sin tráfico
+    seen = -1
+    while not receiver.done.done():
+        try:
+            await asyncio.wait_for(asyncio.shield(receiver.done), IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if len(receiver.chunks) == seen:
+                raise TimeoutError("el receptor dejó de recibir paquetes")
+            seen = len(receiver.chunks)
+    # Margen para los datagramas que aún estén en el búfer del sistema
+    await asyncio.sleep(0.05)
+
+
+async def _run_udp(receiver, relay, batches, end):
+    loop = asyncio.get_running_loop()
+    rx, hop = await loop.create_datagram_endpoint(lambda: UdpEndpoint(receiver.feed),
+                                                  local_addr=("127.0.0.1", 0))
+    target = rx.get_extra_info("sockname")
+    relay_tx = None
+    if relay is not None:
+        out, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=target)
+
+        def forward(frame):
+            frame = relay.process(frame)
+            if frame is not None:
+                out.sendto(frame)
+        relay_tx, hop = await loop.create_datagram_endpoint(lambda: UdpEndpoint(forward),
+                                                            local_addr=("127.0.0.1", 0))
+        target = relay_tx.get_extra_info("sockname")
+
+    tx, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=target)
+    start = time.perf_counter()
+    sent = 0
+    for frames in batches:
+        for frame in frames:
+            tx.sendto(frame)
+        sent += len(frames)
+        # Control de flujo: UDP no lo tiene, y sin él el búfer del primer salto se
+        # desborda. Se espera a que vaya como mucho un lote por detrás (o FLOW_WAIT s).
+        deadline = time.perf_counter() + FLOW_WAIT
+        while sent - hop.received > len(frames) and time.perf_counter() < deadline:
+            await asyncio.sleep(0)
+    tx.sendto(end)
+    await _wait_done(receiver)
+    elapsed = time.perf_counter() - start
+
+    for transport in (tx, rx, relay_tx):
+        if transport is not None:
+            transport.close()
+    if relay is not None:
+        out.close()
+    return elapsed
+
+
+async def _run_tcp(receiver, relay, batches, end):
+    # Cada conexión termina cuando el otro extremo cierra; al final se esperan todas
+    handlers = []
+
+    async def receive(reader, writer):
+        handlers.append(asyncio.current_task())
+        async for frame in read_frames(reader):
+            receiver.feed(frame)
+        writer.close()
+
+    server = await asyncio.start_server(receive, "127.0.0.1", 0)
+    target = server.sockets[0].getsockname()[:2]
+    host, port = target
+    relay_server = None
+    if relay is not None:
+        async def forward(reader, writer):
+            handlers.append(asyncio.current_task())
+            _, out = await asyncio.open_connection(*target)
+            async for frame in read_frames(reader):
+                frame = relay.process(frame)
+                if frame is not None:
+                    out.write(frame)
+                    await out.drain()
+            out.close()
+            writer.close()
+        relay_server = await asyncio.start_server(forward, "127.0.0.1", 0)
+        host, port = relay_server.sockets[0].getsockname()[:2]
+
+    _, writer = await asyncio.open_connection(host, port)
+    start = time.perf_counter()
+    for frames in batches:
+        # Un lote = una sola escritura en el socket
+        writer.write(b"".join(frames))
+        await writer.drain()
+    writer.write(end)
+    await writer.drain()
+    await _wait_done(receiver)
+    elapsed = time.perf_counter() - start
+
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.gather(*handlers)
+    for srv in (relay_server, server):
+        if srv is not None:
+            srv.close()
+            await srv.wait_closed()
+    return elapsed
+
+
+def latency_stats(values):
+    if not values:
+        return {"mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+    us = np.asarray(values) * 1e6
+    return {"mean_us": float(us.mean()), "p50_us": float(np.percentile(us, 50)),
+            "p99_us": float(np.percentile(us, 99)), "max_us": float(us.max())}
+
+
+async def run_loopback(data, protocol="udp", r=3, extended=False, model="bsc", noise_prob=0.0,
+                       loss=0.0, packet_bytes=PACKET_BYTES, batch=BATCH_PACKETS, seed=None, meta=None):
+    # Envía `data` (uint8) por 127.0.0.1 y devuelve (datos recibidos, informe)
+    data = np.asarray(data, dtype=np.uint8).ravel()
+    # Se comprueba la carga codificada (2 x packet_bytes con (7,4)), no los datos
+    size = payload_size(HammingChannel(r, extended), packet_bytes)
+    if protocol == "udp" and size > UDP_MAX_PAYLOAD:
+        raise ValueError(f"paquete demasiado grande para un datagrama UDP ({size} bytes codificados)")
+    if size > FRAME_MAX_PAYLOAD:
+        raise ValueError(f"la carga codificada ({size} bytes) no cabe en la cabecera "
+                         f"(máx. {FRAME_MAX_PAYLOAD} bytes)")
+
+    hamming = HammingChannel(r, extended)
+    relay = None
+    if noise_prob > 0 or loss > 0:
+        relay = Relay(HammingChannel(r, extended, seed=seed),
+                      make_channel(model, noise_prob) if noise_prob > 0 else None, loss)
+    receiver = Reassembler(hamming)
+    batches = iter_batches(hamming, data, packet_bytes, batch)
+    end = end_frame(data, packet_bytes, meta or {})
+
+    run = _run_udp if protocol == "udp" else _run_tcp
+    elapsed = await run(receiver, relay, batches, end)
+
+    received, missing = receiver.assemble()
+    packets = len(receiver.chunks)
+    report = {
+        "code": hamming.name,
+        "protocol": protocol,
+        "packet_bytes": packet_bytes,
+        "batch": batch,
+        "noise_prob": noise_prob,
+        "loss": loss,
+        "packets_sent": receiver.meta["packets"],
+        "packets_received": packets,
+        "packets_lost": len(missing),
+        "dropped_by_relay": relay.dropped if relay else 0,
+        "flipped_bits": relay.flipped_bits if relay else 0,
+        "errors_detected": receiver.errors_detected,
+        "residual_byte_errors": int(np.count_nonzero(np.frombuffer(received, dtype=np.uint8) != data)),
+        "elapsed": elapsed,
+        "packets_per_s": packets / elapsed if elapsed else 0.0,
+        "wire_mbit_per_s": 8 * receiver.wire_bytes / elapsed / 1e6 if elapsed else 0.0,
+        "data_mbit_per_s": 8 * len(data) / elapsed / 1e6 if elapsed else 0.0,
+        "decode_latency": latency_stats(receiver.decode_latency),
+        "transit_latency": latency_stats(receiver.transit_latency),
+    }
+    return received, report
+
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def load_input(path):
+    # Imagen -> píxeles en grises (y su tamaño); cualquier otro archivo -> bytes
+    from PIL import Image, UnidentifiedImageError
+    try:
+        with Image.open(path) as img:
+            pixels = np.asarray(img.convert("L"))
+        return pixels.ravel(), {"width": pixels.shape[1], "height": pixels.shape[0]}
+    except UnidentifiedImageError:
+        return np.fromfile(path, dtype=np.uint8), {}
+
+
+def save_output(path, received, meta):
+    with open(path, "wb") as f:
+        if "width" in meta:
+            write_pgm_header(f, meta["width"], meta["height"])
+        f.write(received)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transmisión Hamming real por 127.0.0.1 (UDP o TCP)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", default=None, help="imagen o archivo a enviar")
+    source.add_argument("--random-bytes", type=int, default=1 << 20, help="enviar N bytes aleatorios")
+    parser.add_argument("--protocol", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--noise", type=float, default=0.0, help="probabilidad de ruido en el relé")
+    parser.add_argument("--model", choices=list(CHANNEL_KEYS), default="bsc")
+    parser.add_argument("--loss", type=float, default=0.0, help="probabilidad de perder cada paquete")
+    parser.add_argument("--packet-bytes", type=int, default=PACKET_BYTES, help="bytes de datos por paquete")
+    parser.add_argument("--batch", type=int, default=BATCH_PACKETS, help="paquetes por lote de envío")
+    parser.add_argument("--r", type=int, default=3, help="bits de paridad: código (2^r-1, 2^r-r-1)")
+    parser.add_argument("--extended", action="store_true", help="añadir paridad global (SECDED)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="guardar lo recibido (PGM si la entrada es imagen)")
+    parser.add_argument("--report", default=None, help="archivo JSON con el informe")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        data, meta = load_input(args.input)
+    else:
+        data, meta = np.random.default_rng(args.seed).integers(0, 256, args.random_bytes, dtype=np.uint8), {}
+
+    try:
+        received, report = asyncio.run(run_loopback(
+            data, args.protocol, args.r, args.extended, args.model, args.noise, args.loss,
+            max(1, args.packet_bytes), max(1, args.batch), args.seed, meta))
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"{report['code']} | {args.protocol.upper()} | {len(data)} bytes en paquetes de {args.packet_bytes}")
+    print(f"Paquetes: {report['packets_received']}/{report['packets_sent']} recibidos "
+          f"({report['packets_lost']} perdidos) | {report['packets_per_s']:,.0f} paquetes/s | "
+          f"{report['wire_mbit_per_s']:.1f} Mbit/s en la red | {report['data_mbit_per_s']:.1f} Mbit/s de datos")
+    print(f"Bits alterados: {report['flipped_bits']} | Errores detectados: {report['errors_detected']} | "
+          f"Bytes erróneos finales: {report['residual_byte_errors']}")
+    for name, key in (("Decodificación", "decode_latency"), ("Tránsito", "transit_latency")):
+        lat = report[key]
+        print(f"Latencia {name.lower()} por paquete: media {lat['mean_us']:.1f} µs | "
+              f"p50 {lat['p50_us']:.1f} µs | p99 {lat['p99_us']:.1f} µs | máx {lat['max_us']:.1f} µs")
+
+    if args.output:
+        save_output(args.output, received, meta)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()